@@ -0,0 +1,426 @@
+"""Shared DOM parsing for documentation sidebars.
+
+Used by both the static HTML extractor (navigation_extractor) and the
+browser-rendered extractor (smart_navigation_extractor).
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Iterator, List, Optional, Tuple
+from urllib.parse import ParseResult, urljoin, urlparse, urlsplit, urlunsplit
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+from .models import DocumentationLink
+
+
+# Absolute http(s) URL, capturing its network location
+_ABSOLUTE_HTTP_RE = re.compile(r'https?://([^/?#]*)')
+
+# Class/id fragments that mark an element as a sidebar candidate
+_SIDEBAR_CLASS_TERMS = ('sidebar', 'side-nav', 'sidenav', 'docs-nav', 'doc-nav')
+_SIDEBAR_ID_TERMS = ('sidebar', 'navigation', 'nav', 'menu')
+
+# URL fragments that mark a link as non-documentation (matched case-insensitively)
+_BLOCKED_URL_PATTERNS = (
+    'twitter.com', 'facebook.com', 'linkedin.com', 'github.com',
+    'discord.com', 'slack.com', 'youtube.com',
+    '/login', '/signup', '/register', '/auth',
+    '/search', '?search=', '/download',
+    'mailto:', 'tel:', 'javascript:',
+)
+_BLOCKED_URL_RE = re.compile('|'.join(map(re.escape, _BLOCKED_URL_PATTERNS)), re.IGNORECASE)
+
+
+def is_blocked_url(url: str) -> bool:
+    """Check whether a URL points at a non-documentation page (social, auth, search, ...)."""
+    return _BLOCKED_URL_RE.search(url) is not None
+
+
+def canonical_url(url: str) -> str:
+    """
+    Reduce a URL to the form used for deduplication.
+    
+    Scheme and host are lowercased, the fragment is dropped and trailing slashes
+    are stripped from the path, so /docs/intro, /docs/intro/ and /docs/intro#top
+    count as one page. The path and query are otherwise kept as-is.
+    """
+    parts = urlsplit(url)
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path.rstrip('/') or '/',
+        parts.query,
+        '',
+    ))
+
+# A sidebar candidate needs at least this many links to count
+_MIN_SIDEBAR_LINKS = 5
+
+_HEADING_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+
+# Docusaurus sidebar item classes
+_DOCUSAURUS_CATEGORY_CLASS = 'theme-doc-sidebar-item-category'
+_DOCUSAURUS_LINK_CLASS = 'theme-doc-sidebar-item-link'
+
+
+class _SidebarStrainer(SoupStrainer):
+    """
+    Parse-time filter that only builds the elements find_sidebar can return.
+    
+    Keeps every nav/aside element and any div whose class or id looks like a
+    sidebar, together with their full subtrees. On Beautiful Soup versions
+    without the allow_tag_creation hook the name rules alone apply, which
+    keeps all nav/aside/div elements.
+    """
+    
+    def __init__(self):
+        super().__init__(name=['nav', 'aside', 'div'])
+    
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        if name in ('nav', 'aside'):
+            return True
+        if name != 'div' or not attrs:
+            return False
+        
+        classes = attrs.get('class') or ''
+        if not isinstance(classes, str):
+            classes = ' '.join(classes)
+        classes = classes.lower()
+        element_id = str(attrs.get('id') or '').lower()
+        return (
+            any(term in classes for term in _SIDEBAR_CLASS_TERMS)
+            or any(term in element_id for term in _SIDEBAR_ID_TERMS)
+        )
+
+
+# Pass as parse_only when only the sidebar is needed from a page
+NAV_STRAINER = _SidebarStrainer()
+
+
+def _is_material_primary_class(value: str) -> bool:
+    # Material for MkDocs pattern (div with md-sidebar class)
+    return 'md-sidebar' in value and 'primary' in value
+
+
+def _is_sidebar_aside_class(value: str) -> bool:
+    # Docusaurus pattern (aside with sidebar class)
+    value = value.lower()
+    return 'sidebar' in value and 'banner' not in value
+
+
+def _is_sidebar_class(value: str) -> bool:
+    # Generic sidebar patterns (div/nav/aside with sidebar-related classes)
+    value = value.lower()
+    return any(term in value for term in _SIDEBAR_CLASS_TERMS) and 'banner' not in value
+
+
+def _is_sidebar_id(value: str) -> bool:
+    # ID-based patterns
+    value = value.lower()
+    return any(term in value for term in _SIDEBAR_ID_TERMS)
+
+
+# Common sidebar patterns in priority order: (tag names, attribute, predicate)
+_SIDEBAR_PATTERNS = (
+    (frozenset({'div'}), 'class', _is_material_primary_class),
+    (frozenset({'aside'}), 'class', _is_sidebar_aside_class),
+    (frozenset({'div', 'nav', 'aside'}), 'class', _is_sidebar_class),
+    (frozenset({'aside', 'nav', 'div'}), 'id', _is_sidebar_id),
+)
+
+
+def _attribute_matches(value, predicate) -> bool:
+    """Match an attribute value the way bs4 matches a callable filter."""
+    if not value:
+        return False
+    if isinstance(value, str):
+        return predicate(value)
+    # Multi-valued attributes match on any single class or on the joined string
+    return any(predicate(item) for item in value) or (len(value) > 1 and predicate(' '.join(value)))
+
+
+def find_sidebar(soup: BeautifulSoup):
+    """Find the main sidebar/navigation element."""
+    # Walk the candidates once, keeping the first element matching each pattern
+    first_matches = [None] * len(_SIDEBAR_PATTERNS)
+    nav_elements = []
+    
+    for elem in soup.find_all(['div', 'nav', 'aside']):
+        for index, (names, attribute, predicate) in enumerate(_SIDEBAR_PATTERNS):
+            if (
+                first_matches[index] is None
+                and elem.name in names
+                and _attribute_matches(elem.get(attribute), predicate)
+            ):
+                first_matches[index] = elem
+        if elem.name != 'div':
+            nav_elements.append(elem)
+    
+    for sidebar in first_matches:
+        # Verify it has a reasonable number of links
+        if sidebar is not None and _has_enough_links(sidebar):
+            return sidebar
+    
+    # Fallback: find any nav or aside (but not banners)
+    for elem in nav_elements:
+        if _no_banner(elem.get('class') or ()) and _has_enough_links(elem):
+            return elem
+    
+    return None
+
+
+def _no_banner(classes) -> bool:
+    """Check that none of an element's classes mark it as a banner."""
+    return not any('banner' in cls.lower() for cls in classes)
+
+
+def _has_enough_links(element) -> bool:
+    """Check whether an element holds at least _MIN_SIDEBAR_LINKS links."""
+    # Stop searching as soon as the threshold is reached
+    return len(element.find_all('a', href=True, limit=_MIN_SIDEBAR_LINKS)) >= _MIN_SIDEBAR_LINKS
+
+
+def extract_links_from_sidebar(sidebar, base_url: str) -> List[DocumentationLink]:
+    """
+    Extract links from sidebar with category information.
+    
+    Handles hierarchical structures like:
+    - Docusaurus (nested ul/li with category classes)
+    - Material for MkDocs (md-nav structure)
+    - Generic nested lists
+    - Flat link lists
+    """
+    # Parse the base URL once for every link in the sidebar
+    base_parsed = urlparse(base_url)
+    links = _pick_extractor(sidebar)(sidebar, base_url, base_parsed)
+    
+    # Deduplicate as links are produced (first occurrence wins)
+    unique_links = {}
+    for link in links:
+        unique_links.setdefault(canonical_url(link.url), link)
+    
+    return list(unique_links.values())
+
+
+def _pick_extractor(sidebar) -> Callable[[Tag, str, ParseResult], Iterator[DocumentationLink]]:
+    """Choose the link extractor for a sidebar's flavour."""
+    # Check if this is a Docusaurus-style sidebar
+    if _is_docusaurus_sidebar(sidebar):
+        return _iter_docusaurus_links
+    # Check if this is a Material for MkDocs sidebar
+    if _is_material_mkdocs_sidebar(sidebar):
+        return _iter_material_mkdocs_links
+    # Generic extraction
+    return _iter_generic_links
+
+
+def _is_docusaurus_sidebar(sidebar) -> bool:
+    """Check if this is a Docusaurus-style sidebar."""
+    # Docusaurus uses specific class names
+    return _has_descendant_class(sidebar, 'theme-doc-sidebar')
+
+
+def _is_material_mkdocs_sidebar(sidebar) -> bool:
+    """Check if this is a Material for MkDocs sidebar."""
+    # Material for MkDocs uses md-sidebar and md-nav classes
+    classes = sidebar.get('class') or ()
+    return any(cls.startswith('md-sidebar') for cls in classes) or _has_descendant_class(sidebar, 'md-nav')
+
+
+def _has_descendant_class(element, fragment: str) -> bool:
+    """Check if any descendant has a class containing fragment, stopping at the first."""
+    # A plain attribute walk; find(class_=callable) costs several Python calls per node
+    for descendant in element.descendants:
+        if isinstance(descendant, Tag):
+            classes = descendant.attrs.get('class')
+            if classes and any(fragment in cls for cls in classes):
+                return True
+    return False
+
+
+def _iter_material_mkdocs_links(sidebar, base_url: str, base_parsed: ParseResult) -> Iterator[DocumentationLink]:
+    """Yield links from Material for MkDocs sidebar."""
+    # Find the main navigation
+    nav = sidebar.find('nav', class_='md-nav')
+    if not nav:
+        return
+    
+    # Find the top-level list
+    root_list = nav.find('ul', class_='md-nav__list')
+    if not root_list:
+        return
+    
+    # One sweep over the anchors; each finds its category by walking up its parents
+    for anchor in root_list.find_all('a', class_='md-nav__link'):
+        item = anchor.find_parent('li')
+        if item is None or 'md-nav__item' not in (item.get('class') or ()) or _item_link(item) is not anchor:
+            continue
+        
+        category = None
+        in_tree = True
+        parent = item.parent
+        while parent is not None and parent is not root_list:
+            if parent.name == 'li':
+                if not _is_nested_item(parent):
+                    # Inside a page's own entry, e.g. the active page's table of contents
+                    in_tree = False
+                    break
+                if category is None:
+                    # The nearest section with a title names the category
+                    category_link = _item_link(parent)
+                    if category_link:
+                        category = category_link.get_text(strip=True) or None
+            parent = parent.parent
+        
+        if not in_tree:
+            continue
+        
+        doc_link = create_doc_link(anchor, base_url, base_parsed.netloc, category, base_parsed)
+        if doc_link:
+            yield doc_link
+
+
+def _item_link(item):
+    """Find the anchor that represents a Material nav item (its title link when nested)."""
+    link = item.find('a', class_='md-nav__link', recursive=False)
+    if not link and _is_nested_item(item):
+        # Sections with an index page wrap their link in a container; only the
+        # item's own container counts, not those of its children
+        container = item.find('div', class_='md-nav__link', recursive=False)
+        if container:
+            link = container.find('a', class_='md-nav__link')
+    return link
+
+
+def _is_nested_item(item) -> bool:
+    """Check if a Material nav item has children."""
+    return 'md-nav__item--nested' in frozenset(item.get('class') or ())
+
+
+def _iter_docusaurus_links(sidebar, base_url: str, base_parsed: ParseResult) -> Iterator[DocumentationLink]:
+    """Yield links from Docusaurus-style sidebar."""
+    # Find all list items
+    list_items = sidebar.find_all('li', class_=lambda x: x and 'theme-doc-sidebar-item' in str(x))
+    
+    current_category = None
+    
+    for item in list_items:
+        # bs4 already splits the class attribute into a list
+        classes = item.get('class') or ()
+        
+        # Check if this is a category item
+        if _DOCUSAURUS_CATEGORY_CLASS in classes:
+            # This is a category - get the category name
+            category_link = item.find('a', class_=lambda x: x and 'menu__link--sublist' in str(x))
+            if category_link:
+                current_category = category_link.get_text(strip=True)
+            
+            # Extract nested links under this category
+            nested_ul = item.find('ul', class_='menu__list')
+            if nested_ul:
+                nested_items = nested_ul.find_all('li', recursive=False)
+                for nested_item in nested_items:
+                    link = nested_item.find('a', href=True)
+                    if link:
+                        doc_link = create_doc_link(link, base_url, base_parsed.netloc, current_category, base_parsed)
+                        if doc_link:
+                            yield doc_link
+        
+        # Check if this is a regular link item (not a category)
+        elif _DOCUSAURUS_LINK_CLASS in classes:
+            link = item.find('a', href=True, recursive=False)
+            if link:
+                doc_link = create_doc_link(link, base_url, base_parsed.netloc, None, base_parsed)
+                if doc_link:
+                    yield doc_link
+
+
+def _iter_generic_links(sidebar, base_url: str, base_parsed: ParseResult) -> Iterator[DocumentationLink]:
+    """Yield links from generic sidebar structure."""
+    # Walk the sidebar once, carrying the most recent heading as the category
+    current_category = None
+    heading_links = set()
+    for element in sidebar.descendants:
+        if not isinstance(element, Tag):
+            continue
+        
+        if element.name in _HEADING_TAGS:
+            # Links inside a heading belong to the section before it, not under their own title
+            for link in element.find_all('a', href=True):
+                heading_links.add(id(link))
+                doc_link = create_doc_link(link, base_url, base_parsed.netloc, current_category, base_parsed)
+                if doc_link:
+                    yield doc_link
+            heading_text = element.get_text(strip=True)
+            # Only use as category if it's non-empty and reasonably short
+            if heading_text:
+                current_category = heading_text if len(heading_text) < 50 else None
+        elif element.name == 'a' and element.get('href') and id(element) not in heading_links:
+            doc_link = create_doc_link(element, base_url, base_parsed.netloc, current_category, base_parsed)
+            if doc_link:
+                yield doc_link
+
+
+def fast_urljoin(base_url: str, base_parsed: ParseResult, href: str) -> Tuple[str, str]:
+    """
+    Resolve a link against the base URL, skipping urljoin for the common cases.
+    
+    Args:
+        base_url: Base URL for resolving relative links
+        base_parsed: Parsed form of base_url
+        href: Link target as found in the page
+        
+    Returns:
+        Tuple of (absolute URL, network location of that URL)
+    """
+    # Dot segments still need urljoin's normalization
+    if '/.' not in href:
+        match = _ABSOLUTE_HTTP_RE.match(href)
+        if match:
+            return href, match.group(1)
+        if href.startswith('/') and not href.startswith('//'):
+            return f"{base_parsed.scheme}://{base_parsed.netloc}{href}", base_parsed.netloc
+    
+    return _resolve_with_urljoin(base_url, href)
+
+
+@lru_cache(maxsize=4096)
+def _resolve_with_urljoin(base_url: str, href: str) -> Tuple[str, str]:
+    """Resolve a link with urljoin, remembering results for repeat crawls of a site."""
+    absolute_url = urljoin(base_url, href)
+    return absolute_url, urlparse(absolute_url).netloc
+
+
+def create_doc_link(
+    link_tag,
+    base_url: str,
+    base_domain: str,
+    category: Optional[str],
+    base_parsed: Optional[ParseResult] = None
+) -> Optional[DocumentationLink]:
+    """Create a DocumentationLink from an anchor tag."""
+    href = link_tag.get('href', '')
+    title = link_tag.get_text(strip=True) or link_tag.get('title', '')
+    
+    # Skip empty or anchor-only links
+    if not href or not title or href.startswith('#'):
+        return None
+    
+    # Resolve relative URLs
+    if base_parsed is None:
+        base_parsed = urlparse(base_url)
+    absolute_url, link_domain = fast_urljoin(base_url, base_parsed, href)
+    
+    # Filter out external links
+    if link_domain and link_domain != base_domain:
+        return None
+    
+    # Filter out non-documentation patterns
+    if is_blocked_url(absolute_url):
+        return None
+    
+    return DocumentationLink(
+        url=absolute_url,
+        title=title,
+        category=category
+    )
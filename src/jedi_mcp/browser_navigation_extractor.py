@@ -1,49 +1,16 @@
 """Navigation extraction using headless browser and AI."""
 
 import asyncio
-from typing import List, Optional
-from urllib.parse import urljoin, urlparse
+from typing import List
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright, Browser, Page
 from strands import Agent
 
 from .models import DocumentationLink
+from ._sidebar_parser import fast_urljoin, is_blocked_url
+from .navigation_extractor import _parse_agent_json
 from .model_config import create_navigation_model
-
-
-async def fetch_rendered_html(url: str, wait_for_selector: Optional[str] = None) -> str:
-    """
-    Fetch HTML content using headless browser to handle JavaScript-rendered content.
-    
-    Args:
-        url: URL to fetch
-        wait_for_selector: Optional CSS selector to wait for before extracting HTML
-        
-    Returns:
-        Rendered HTML content
-    """
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        
-        try:
-            # Navigate to the page
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            
-            # Wait for specific selector if provided
-            if wait_for_selector:
-                await page.wait_for_selector(wait_for_selector, timeout=10000)
-            else:
-                # Default: wait a bit for dynamic content to load
-                await page.wait_for_timeout(2000)
-            
-            # Get the rendered HTML
-            html_content = await page.content()
-            
-            return html_content
-            
-        finally:
-            await browser.close()
+from .smart_navigation_extractor import fetch_rendered_html
 
 
 async def extract_navigation_with_browser(url: str) -> List[DocumentationLink]:
@@ -151,24 +118,17 @@ Return ONLY a JSON array with ALL sidebar documentation links. No other text."""
     response = agent(prompt)
     
     # Parse agent response
-    import json
     try:
-        # Extract JSON from response
-        response_text = str(response)
-        start_idx = response_text.find('[')
-        end_idx = response_text.rfind(']') + 1
-        if start_idx >= 0 and end_idx > start_idx:
-            json_str = response_text[start_idx:end_idx]
-            links_data = json.loads(json_str)
-        else:
-            links_data = []
-    except (json.JSONDecodeError, ValueError):
+        links_data = _parse_agent_json(str(response))
+    except ValueError:
         # Fallback: extract links manually
         links_data = _fallback_link_extraction(soup, url)
     
     # Process and filter links
-    base_domain = urlparse(url).netloc
-    documentation_links = []
+    base_parsed = urlparse(url)
+    base_domain = base_parsed.netloc
+    # Keyed by URL so filtering and deduplication happen in a single pass
+    documentation_links = {}
     
     for link_data in links_data:
         link_url = link_data.get('url', '')
@@ -176,22 +136,18 @@ Return ONLY a JSON array with ALL sidebar documentation links. No other text."""
             continue
             
         # Resolve relative URLs
-        absolute_url = urljoin(url, link_url)
+        absolute_url, link_domain = fast_urljoin(url, base_parsed, link_url)
         
         # Filter out external links (different domain)
-        link_domain = urlparse(absolute_url).netloc
         if link_domain and link_domain != base_domain:
             continue
         
+        # Keep the first occurrence of each URL
+        if absolute_url in documentation_links:
+            continue
+        
         # Filter out non-documentation patterns
-        url_lower = absolute_url.lower()
-        if any(pattern in url_lower for pattern in [
-            'twitter.com', 'facebook.com', 'linkedin.com', 'github.com',
-            'discord.com', 'slack.com', 'youtube.com',
-            '/login', '/signup', '/register', '/auth',
-            '/search', '?search=', '/download',
-            'mailto:', 'tel:', 'javascript:'
-        ]):
+        if is_blocked_url(absolute_url):
             continue
         
         # Create DocumentationLink
@@ -200,17 +156,9 @@ Return ONLY a JSON array with ALL sidebar documentation links. No other text."""
             title=link_data.get('title'),
             category=link_data.get('category')
         )
-        documentation_links.append(doc_link)
-    
-    # Remove duplicates while preserving order
-    seen_urls = set()
-    unique_links = []
-    for link in documentation_links:
-        if link.url not in seen_urls:
-            seen_urls.add(link.url)
-            unique_links.append(link)
+        documentation_links[absolute_url] = doc_link
     
-    return unique_links
+    return list(documentation_links.values())
 
 
 def _fallback_link_extraction(soup: BeautifulSoup, base_url: str) -> List[dict]:
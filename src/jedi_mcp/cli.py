@@ -14,10 +14,12 @@ from bs4 import BeautifulSoup
 
 from .models import CrawlConfig, GenerationResult
 from .database import DatabaseManager
-from .navigation_extractor import extract_navigation_links, extract_navigation_links_async
+from .navigation_extractor import (
+    extract_navigation_links,
+    extract_navigation_links_async,
+    close_browser_pool,
+)
 from .crawler import crawl_pages
-from .content_processor import process_content
-from .mcp_server import run_mcp_server
 
 
 # Configure logging
@@ -28,6 +30,10 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Project names: alphanumeric characters, hyphens and underscores
+_PROJECT_NAME_RE = re.compile(r'[a-zA-Z0-9_-]+')
+
+
 def validate_url(url: str) -> bool:
     """
     Validate URL format (http/https scheme).
@@ -57,8 +63,7 @@ def validate_project_name(name: str) -> bool:
     """
     # Must contain only alphanumeric characters, hyphens, and underscores
     # Must not be empty
-    pattern = r'^[a-zA-Z0-9_-]+$'
-    return bool(re.match(pattern, name))
+    return _PROJECT_NAME_RE.fullmatch(name) is not None
 
 
 def _display_links_table(links: list, start_idx: int = 0, count: int = 20):
@@ -186,28 +191,35 @@ async def _verify_and_filter_links(links: list, html_content: str, base_url: str
                 click.echo(f"✓ Found {len(elements)} elements")
                 
                 # Extract links from elements
-                from .navigation_extractor import _create_doc_link
+                from ._sidebar_parser import create_doc_link
                 from urllib.parse import urlparse
                 
-                base_domain = urlparse(base_url).netloc
+                # Parse the base URL once rather than once per matched link
+                base_parsed = urlparse(base_url)
+                base_domain = base_parsed.netloc
                 new_links = []
                 
                 for elem in elements:
                     if elem.name == 'a' and elem.get('href'):
-                        doc_link = _create_doc_link(elem, base_url, base_domain, None)
+                        doc_link = create_doc_link(elem, base_url, base_domain, None, base_parsed)
                         if doc_link:
                             new_links.append(doc_link)
                     else:
                         # Look for links inside the element
                         for a_tag in elem.find_all('a', href=True):
-                            doc_link = _create_doc_link(a_tag, base_url, base_domain, None)
+                            doc_link = create_doc_link(a_tag, base_url, base_domain, None, base_parsed)
                             if doc_link:
                                 new_links.append(doc_link)
                 
                 if new_links:
-                    # Remove duplicates
+                    # Remove duplicates, within the new links too (overlapping
+                    # selector matches find the same anchor more than once)
                     existing_urls = {link.url for link in current_links}
-                    unique_new_links = [link for link in new_links if link.url not in existing_urls]
+                    unique_new = {}
+                    for link in new_links:
+                        if link.url not in existing_urls:
+                            unique_new.setdefault(link.url, link)
+                    unique_new_links = list(unique_new.values())
                     
                     if unique_new_links:
                         current_links.extend(unique_new_links)
@@ -253,6 +265,7 @@ async def generate_mcp_server_async(
     Returns:
         GenerationResult containing status and output path
     """
+    db_manager = None
     try:
         # Initialize database
         click.echo("📦 Initializing database...")
@@ -287,6 +300,8 @@ async def generate_mcp_server_async(
                 except Exception as e:
                     click.echo(f"❌ Browser-based extraction failed: {e}")
                     click.echo(f"   Make sure Playwright is installed: pip install playwright && playwright install")
+                finally:
+                    await close_browser_pool()
             else:
                 click.echo(f"   Skipping browser-based extraction.")
         
@@ -336,6 +351,8 @@ async def generate_mcp_server_async(
         
         # Step 3: Process content and group
         click.echo("🤖 Processing content and generating summaries (this may take a minute)...")
+        # Import the AI stack only once pages are ready to process
+        from .content_processor import process_content
         content_groups = process_content(pages)
         
         if not content_groups:
@@ -350,8 +367,9 @@ async def generate_mcp_server_async(
         
         # Step 4: Store in database
         click.echo("💾 Storing content in database...")
-        for group in content_groups:
-            db_manager.store_content_group(name, group, url)
+        # Indexes are rebuilt once after the whole project is written
+        with db_manager.bulk_ingest():
+            db_manager.store_content_groups(name, content_groups, url)
         
         click.echo(f"✓ Stored {len(content_groups)} content groups")
         
@@ -378,6 +396,9 @@ async def generate_mcp_server_async(
             database_path=None,
             project_name=name
         )
+    finally:
+        if db_manager is not None:
+            db_manager.close()
 
 
 @click.group()
@@ -547,6 +568,8 @@ def list_projects(db_path: Path):
         logger.error(f"Failed to list projects: {e}", exc_info=True)
         click.echo(f"❌ Error: Failed to list projects: {str(e)}", err=True)
         sys.exit(1)
+    finally:
+        db_manager.close()
 
 
 @main.command()
@@ -606,7 +629,9 @@ def serve(project: str, db_path: Path, transport: str, host: str, port: int):
     db_manager = DatabaseManager(db_path)
     
     try:
-        content_groups = db_manager.get_all_content_groups(project)
+        content_groups = db_manager.get_content_group_summaries(project)
+        # The server opens its own connections
+        db_manager.close()
         
         if not content_groups:
             click.echo(
@@ -640,7 +665,8 @@ def serve(project: str, db_path: Path, transport: str, host: str, port: int):
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
         
-        # Run the MCP server
+        # Run the MCP server (FastMCP is only imported by this command)
+        from .mcp_server import run_mcp_server
         run_mcp_server(project, db_path, transport=transport, host=host, port=port)
         
     except Exception as e:
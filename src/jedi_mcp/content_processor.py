@@ -3,13 +3,54 @@
 import json
 import logging
 from typing import List
-from strands import Agent
 
 from .models import PageContent, ContentGroup
 from .model_config import create_content_processing_model
 
 logger = logging.getLogger(__name__)
 
+# Strands Agent class, imported on first use by process_content
+Agent = None
+
+# orjson is an optional speedup for serializing prompts and parsing responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_for_prompt(data) -> str:
+    """
+    Serialize page data as indented JSON for a model prompt.
+    
+    Args:
+        data: JSON-serializable page data
+        
+    Returns:
+        JSON text indented by two spaces
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _loads_response(json_str: str):
+    """
+    Parse JSON text cut out of a model response.
+    
+    Args:
+        json_str: JSON text
+        
+    Returns:
+        The parsed value
+        
+    Raises:
+        ValueError: If the text is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(json_str)
+    return json.loads(json_str)
+
 
 def process_content(pages: List[PageContent]) -> List[ContentGroup]:
     """
@@ -33,6 +74,11 @@ def process_content(pages: List[PageContent]) -> List[ContentGroup]:
     
     logger.info(f"Processing {len(pages)} pages for content grouping")
     
+    # Import the AI stack only when there is content to process
+    global Agent
+    if Agent is None:
+        from strands import Agent
+    
     # Create model for content processing
     model = create_content_processing_model()
     
@@ -85,7 +131,7 @@ Guidelines:
     grouping_prompt = f"""Analyze these {len(pages)} documentation pages and group them logically.
 
 Pages:
-{json.dumps(page_summaries, indent=2)}
+{_dumps_for_prompt(page_summaries)}
 
 Return only the JSON array of groups."""
     
@@ -99,7 +145,7 @@ Return only the JSON array of groups."""
         end_idx = response_text.rfind(']') + 1
         if start_idx >= 0 and end_idx > start_idx:
             json_str = response_text[start_idx:end_idx]
-            groups_data = json.loads(json_str)
+            groups_data = _loads_response(json_str)
         else:
             logger.warning("No JSON array found in grouping response, using fallback")
             groups_data = _fallback_grouping(pages)
@@ -225,7 +271,7 @@ def _prioritize_code_blocks(code_blocks: List[str]) -> List[str]:
 
 
 def _generate_group_summary(
-    agent: Agent,
+    agent: "Agent",
     group_name: str,
     group_description: str,
     pages: List[PageContent]
@@ -267,7 +313,7 @@ Group: {group_name}
 Description: {group_description}
 
 Pages in this group:
-{json.dumps(pages_content, indent=2)}
+{_dumps_for_prompt(pages_content)}
 
 Generate a detailed markdown summary that:
 1. Starts with a clear heading (# {group_name.replace('-', ' ').title()})
@@ -295,6 +341,8 @@ Focus on practical, actionable information.
 
 Return ONLY the markdown content, no additional commentary."""
     
+    # Each summary stands alone; drop earlier turns so they are not resent with this prompt
+    agent.messages.clear()
     summary_response = agent(summary_prompt)
     summary_markdown = str(summary_response).strip()
     
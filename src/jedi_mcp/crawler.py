@@ -2,11 +2,11 @@
 
 import asyncio
 import logging
-from typing import List
+from typing import Iterator, List, Optional
 from functools import wraps
 
 import httpx
-from bs4 import BeautifulSoup
+from lxml import etree
 
 from .models import DocumentationLink, PageContent, CrawlConfig
 
@@ -80,6 +80,15 @@ async def fetch_page_content(
         raise
 
 
+_HTML_PARSER = etree.HTMLParser(encoding='utf-8')
+
+# Page chrome left out of the extracted content and code blocks
+_NON_CONTENT_TAGS = frozenset({'nav', 'footer', 'aside', 'header'})
+
+# Tags whose strings are not page text (BeautifulSoup's get_text skips these too)
+_NON_TEXT_TAGS = frozenset({'script', 'style', 'template', 'rt', 'rp'})
+
+
 def extract_content_from_html(html: str, url: str) -> PageContent:
     """
     Extract main content from HTML, excluding navigation and other non-content elements.
@@ -91,37 +100,37 @@ def extract_content_from_html(html: str, url: str) -> PageContent:
     Returns:
         PageContent with extracted text and code blocks
     """
-    soup = BeautifulSoup(html, 'lxml')
+    # Parse bytes with a fixed encoding so pages with an XML declaration are accepted
+    root = etree.HTML(html.encode('utf-8'), _HTML_PARSER)
+    if root is None:
+        return PageContent(url=url, title="", content="", code_blocks=[])
     
-    # Extract title from h1 or title tag
+    # Extract title from h1 or title tag (navigation is not excluded here)
     title = ""
-    h1_tag = soup.find('h1')
-    if h1_tag:
-        title = h1_tag.get_text(strip=True)
-    else:
-        title_tag = soup.find('title')
-        if title_tag:
-            title = title_tag.get_text(strip=True)
-    
-    # Remove non-content elements
-    for element in soup.find_all(['nav', 'footer', 'aside', 'header']):
-        element.decompose()
-    
-    # Extract code blocks before getting text content
+    title_tag = next(root.iter('h1'), None)
+    if title_tag is None:
+        title_tag = next(root.iter('title'), None)
+    if title_tag is not None:
+        title = ''.join(_stripped(_iter_strings(title_tag)))
+    
+    # Extract code blocks, skipping those inside non-content elements
     code_blocks = []
-    for code_tag in soup.find_all(['pre', 'code']):
-        code_text = code_tag.get_text()
+    for code_tag in root.iter('pre', 'code'):
+        if _in_non_content(code_tag):
+            continue
+        code_text = ''.join(_iter_strings(code_tag, _NON_CONTENT_TAGS))
         if code_text.strip():
             code_blocks.append(code_text)
     
     # Extract main content
     # Try to find main content area first
-    main_content = soup.find('main') or soup.find('article') or soup.find('body')
-    
-    if main_content:
-        content = main_content.get_text(separator='\n', strip=True)
-    else:
-        content = soup.get_text(separator='\n', strip=True)
+    main_content = root
+    for tag in ('main', 'article', 'body'):
+        element = _find_content_element(root, tag)
+        if element is not None:
+            main_content = element
+            break
+    content = '\n'.join(_stripped(_iter_strings(main_content, _NON_CONTENT_TAGS)))
     
     return PageContent(
         url=url,
@@ -131,6 +140,76 @@ def extract_content_from_html(html: str, url: str) -> PageContent:
     )
 
 
+def _find_content_element(root, tag: str) -> Optional[etree._Element]:
+    """First element with this tag outside non-content elements, or None."""
+    for element in root.iter(tag):
+        if not _in_non_content(element):
+            return element
+    return None
+
+
+def _in_non_content(element) -> bool:
+    """Whether the element sits inside (or is) a non-content element."""
+    if element.tag in _NON_CONTENT_TAGS:
+        return True
+    return any(ancestor.tag in _NON_CONTENT_TAGS for ancestor in element.iterancestors())
+
+
+def _stripped(strings: Iterator[str]) -> Iterator[str]:
+    """Strip each string and drop the ones left empty."""
+    for text in strings:
+        text = text.strip()
+        if text:
+            yield text
+
+
+def _iter_strings(element, skip_tags: frozenset = frozenset()) -> Iterator[str]:
+    """
+    Yield the text strings inside an element in document order.
+    
+    Matches BeautifulSoup's string traversal: text before and after each child
+    element is a separate string, and comments, processing instructions and
+    the contents of script-like tags are left out. Subtrees rooted at tags in
+    skip_tags are left out as well, but the text following them is kept.
+    
+    Args:
+        element: lxml element to read
+        skip_tags: Tag names whose subtrees are not read
+        
+    Yields:
+        Text strings, unstripped
+    """
+    if element.tag in _NON_TEXT_TAGS or any(
+        ancestor.tag in _NON_TEXT_TAGS for ancestor in element.iterancestors()
+    ):
+        return
+    
+    if element.text:
+        yield element.text
+    
+    # Each entry is a child iterator and the tail to yield once it is exhausted
+    stack = [(iter(element), None)]
+    while stack:
+        children, tail = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            if tail:
+                yield tail
+            continue
+        
+        tag = child.tag
+        if not isinstance(tag, str) or tag in _NON_TEXT_TAGS or tag in skip_tags:
+            # Comments and skipped subtrees contribute only the text after them
+            if child.tail:
+                yield child.tail
+            continue
+        
+        if child.text:
+            yield child.text
+        stack.append((iter(child), child.tail))
+
+
 async def crawl_pages(
     links: List[DocumentationLink],
     config: CrawlConfig
@@ -1,13 +1,37 @@
 """Database management for the Jedi-MCP system."""
 
 import sqlite3
+import sys
+import threading
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from contextlib import contextmanager
 
 from .models import ContentGroup, PageContent
 
 
+# Stored in PRAGMA user_version once the tables below exist
+SCHEMA_VERSION = 2
+
+# Secondary indexes by name (content_groups is searched through the
+# automatic index SQLite builds for UNIQUE(project_id, name))
+_INDEX_DDL = {
+    'idx_pages_group': """
+        CREATE INDEX IF NOT EXISTS idx_pages_group 
+        ON pages(content_group_id)
+    """,
+}
+
+# Rows fetched per round trip when streaming query results
+FETCH_BATCH_SIZE = 256
+
+# Bytes of the database file SQLite may memory-map for reads (0 disables)
+MMAP_SIZE = 0 if sys.platform == 'win32' else 256 * 1024 * 1024
+
+# Page cache per connection, in KiB
+CACHE_SIZE_KIB = 64 * 1024
+
+
 class DatabaseManager:
     """Manages SQLite database operations for documentation storage."""
     
@@ -23,19 +47,57 @@ class DatabaseManager:
         
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection per thread, opened on first use and kept for later calls
+        self._local = threading.local()
+        # Every connection opened by any thread, so close() can reach them all
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        # Thread running bulk_ingest(), which only changes that thread's connection
+        self._bulk_thread: Optional[int] = None
     
     @contextmanager
     def _get_connection(self):
         """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        if self._bulk_thread is not None and self._bulk_thread != threading.get_ident():
+            raise RuntimeError("bulk_ingest() is in progress on another thread")
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
         try:
             yield conn
             conn.commit()
         except Exception:
             conn.rollback()
             raise
-        finally:
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection configured for this database."""
+        # Only the opening thread uses it, but close() may run on another thread
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # WAL lets readers run alongside a writer; NORMAL sync is safe under WAL
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Page content is read straight from the mapped file instead of via read() copies
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        # Keep temporary sort tables in memory and allow a larger page cache
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+        return conn
+    
+    def close(self) -> None:
+        """
+        Close every connection opened by this manager.
+        
+        The manager stays usable; the next call opens a fresh connection.
+        """
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for conn in connections:
             conn.close()
     
     def initialize_schema(self, project_name: str) -> None:
@@ -48,51 +110,91 @@ class DatabaseManager:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
-            # Create projects table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS projects (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    root_url TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Create content_groups table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS content_groups (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    project_id INTEGER NOT NULL,
-                    name TEXT NOT NULL,
-                    summary_markdown TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (project_id) REFERENCES projects(id),
-                    UNIQUE(project_id, name)
-                )
-            """)
-            
-            # Create pages table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS pages (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    content_group_id INTEGER NOT NULL,
-                    url TEXT NOT NULL,
-                    title TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    FOREIGN KEY (content_group_id) REFERENCES content_groups(id)
-                )
-            """)
+            # Tables only need creating once per database file
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                # Create projects table
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS projects (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        name TEXT UNIQUE NOT NULL,
+                        root_url TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
+                # Create content_groups table
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS content_groups (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        project_id INTEGER NOT NULL,
+                        name TEXT NOT NULL,
+                        summary_markdown TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        FOREIGN KEY (project_id) REFERENCES projects(id),
+                        UNIQUE(project_id, name)
+                    )
+                """)
+                
+                # Create pages table
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS pages (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        content_group_id INTEGER NOT NULL,
+                        url TEXT NOT NULL,
+                        title TEXT NOT NULL,
+                        content TEXT NOT NULL,
+                        FOREIGN KEY (content_group_id) REFERENCES content_groups(id)
+                    )
+                """)
+                
+                # Version 2: project_id lookups are covered by UNIQUE(project_id, name)
+                cursor.execute("DROP INDEX IF EXISTS idx_content_groups_project")
+                
+                cursor.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
             
-            # Create indexes
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_content_groups_project 
-                ON content_groups(project_id)
-            """)
+            # Create indexes (this also restores any left dropped by an interrupted bulk_ingest)
+            for index_sql in _INDEX_DDL.values():
+                cursor.execute(index_sql)
+    
+    @contextmanager
+    def bulk_ingest(self):
+        """
+        Context manager for loading many content groups at once.
+        
+        Secondary indexes are dropped for the duration and rebuilt once at the
+        end, and per-commit syncing is turned off. Intended for large imports;
+        a crash mid-load can lose the imported rows, and the indexes are
+        recreated by the next initialize_schema() call.
+        
+        Single-thread only: the sync setting applies to the calling thread's
+        connection, so other threads of this manager are refused until the
+        block exits. Readers in other processes run without the dropped
+        indexes meanwhile.
+        
+        Yields:
+            This DatabaseManager
             
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_pages_group 
-                ON pages(content_group_id)
-            """)
+        Raises:
+            RuntimeError: If a bulk ingest is already in progress
+        """
+        if self._bulk_thread is not None:
+            raise RuntimeError("bulk_ingest() is already in progress")
+        self._bulk_thread = threading.get_ident()
+        try:
+            with self._get_connection() as conn:
+                for index_name in _INDEX_DDL:
+                    conn.execute(f"DROP INDEX IF EXISTS {index_name}")
+                conn.execute("PRAGMA synchronous=OFF")
+            try:
+                yield self
+            finally:
+                with self._get_connection() as conn:
+                    for index_sql in _INDEX_DDL.values():
+                        conn.execute(index_sql)
+                    conn.execute("PRAGMA synchronous=NORMAL")
+        finally:
+            self._bulk_thread = None
     
     def _get_or_create_project(self, conn: sqlite3.Connection, project_name: str, root_url: str = "") -> int:
         """
@@ -137,33 +239,53 @@ class DatabaseManager:
         Returns:
             ID of the stored content group
         """
+        return self.store_content_groups(project_name, [group], root_url)[0]
+    
+    def store_content_groups(self, project_name: str, groups: List[ContentGroup], root_url: str = "") -> List[int]:
+        """
+        Store several content groups and their pages in a single transaction.
+        
+        Args:
+            project_name: Name of the documentation project
+            groups: ContentGroups to store
+            root_url: Root URL of the documentation
+            
+        Returns:
+            IDs of the stored content groups, in input order
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            # Take the write lock up front: the whole batch commits once, and a
+            # busy database is reported here rather than midway through the batch
+            if not conn.in_transaction:
+                cursor.execute("BEGIN IMMEDIATE")
             
             # Get or create project
             project_id = self._get_or_create_project(conn, project_name, root_url)
             
-            # Insert content group
-            cursor.execute(
-                """
-                INSERT INTO content_groups (project_id, name, summary_markdown)
-                VALUES (?, ?, ?)
-                """,
-                (project_id, group.name, group.summary_markdown)
-            )
-            content_group_id = cursor.lastrowid
-            
-            # Insert pages
-            for page in group.pages:
+            content_group_ids = []
+            for group in groups:
+                # Insert content group
                 cursor.execute(
+                    """
+                    INSERT INTO content_groups (project_id, name, summary_markdown)
+                    VALUES (?, ?, ?)
+                    """,
+                    (project_id, group.name, group.summary_markdown)
+                )
+                content_group_id = cursor.lastrowid
+                content_group_ids.append(content_group_id)
+                
+                # Insert pages
+                cursor.executemany(
                     """
                     INSERT INTO pages (content_group_id, url, title, content)
                     VALUES (?, ?, ?, ?)
                     """,
-                    (content_group_id, page.url, page.title, page.content)
+                    [(content_group_id, page.url, page.title, page.content) for page in group.pages]
                 )
             
-            return content_group_id
+            return content_group_ids
     
     def get_all_content_groups(self, project_name: str) -> List[ContentGroup]:
         """
@@ -175,64 +297,91 @@ class DatabaseManager:
         Returns:
             List of ContentGroup objects
         """
+        return list(self.iter_content_groups(project_name))
+    
+    def get_content_group_summaries(self, project_name: str) -> List[dict]:
+        """
+        Retrieve the name and summary of every content group, without pages.
+        
+        Args:
+            project_name: Name of the documentation project
+            
+        Returns:
+            List of dictionaries with 'name' and 'summary_markdown' keys
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
-            # Get project ID
             cursor.execute(
-                "SELECT id FROM projects WHERE name = ?",
+                """
+                SELECT cg.name, cg.summary_markdown
+                FROM content_groups cg
+                JOIN projects p ON p.id = cg.project_id
+                WHERE p.name = ?
+                ORDER BY cg.id
+                """,
                 (project_name,)
             )
-            project_row = cursor.fetchone()
             
-            if not project_row:
-                return []
+            return [
+                {'name': row[0], 'summary_markdown': row[1]}
+                for row in cursor.fetchall()
+            ]
+    
+    def iter_content_groups(self, project_name: str) -> Iterator[ContentGroup]:
+        """
+        Yield the content groups of a project one at a time.
+        
+        Rows are streamed from a single query in batches, so only one group's
+        pages are held in memory at a time.
+        
+        Args:
+            project_name: Name of the documentation project
             
-            project_id = project_row[0]
+        Yields:
+            ContentGroup objects in storage order
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.arraysize = FETCH_BATCH_SIZE
             
-            # Get all content groups for this project
+            # Groups without pages still appear once, with NULL page columns
             cursor.execute(
                 """
-                SELECT id, name, summary_markdown
-                FROM content_groups
-                WHERE project_id = ?
+                SELECT cg.id, cg.name, cg.summary_markdown, p.url, p.title, p.content
+                FROM projects pr
+                JOIN content_groups cg ON cg.project_id = pr.id
+                LEFT JOIN pages p ON p.content_group_id = cg.id
+                WHERE pr.name = ?
+                ORDER BY cg.id, p.id
                 """,
-                (project_id,)
+                (project_name,)
             )
             
-            content_groups = []
-            for row in cursor.fetchall():
-                group_id = row[0]
-                
-                # Get pages for this content group
-                cursor.execute(
-                    """
-                    SELECT url, title, content
-                    FROM pages
-                    WHERE content_group_id = ?
-                    """,
-                    (group_id,)
-                )
-                
-                pages = [
-                    PageContent(
-                        url=page_row[0],
-                        title=page_row[1],
-                        content=page_row[2],
-                        code_blocks=[]  # Code blocks not stored separately
-                    )
-                    for page_row in cursor.fetchall()
-                ]
-                
-                content_groups.append(
-                    ContentGroup(
-                        name=row[1],
-                        summary_markdown=row[2],
-                        pages=pages
-                    )
-                )
+            group = None
+            group_id = None
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                for row in rows:
+                    if row[0] != group_id:
+                        if group is not None:
+                            yield group
+                        group_id = row[0]
+                        group = ContentGroup(name=row[1], summary_markdown=row[2], pages=[])
+                    if row[3] is not None:
+                        group.pages.append(
+                            PageContent(
+                                url=row[3],
+                                title=row[4],
+                                content=row[5],
+                                code_blocks=[]  # Code blocks not stored separately
+                            )
+                        )
             
-            return content_groups
+            if group is not None:
+                yield group
     
     def get_content_group_by_name(self, project_name: str, group_name: str) -> Optional[ContentGroup]:
         """
@@ -248,57 +397,39 @@ class DatabaseManager:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
-            # Get project ID
-            cursor.execute(
-                "SELECT id FROM projects WHERE name = ?",
-                (project_name,)
-            )
-            project_row = cursor.fetchone()
-            
-            if not project_row:
-                return None
-            
-            project_id = project_row[0]
-            
-            # Get content group
+            # Project, group and pages in one round trip; a group without
+            # pages comes back as a single row with NULL page columns
             cursor.execute(
                 """
-                SELECT id, name, summary_markdown
-                FROM content_groups
-                WHERE project_id = ? AND name = ?
+                SELECT cg.name, cg.summary_markdown, p.url, p.title, p.content
+                FROM projects pr
+                JOIN content_groups cg ON cg.project_id = pr.id
+                LEFT JOIN pages p ON p.content_group_id = cg.id
+                WHERE pr.name = ? AND cg.name = ?
+                ORDER BY p.id
                 """,
-                (project_id, group_name)
+                (project_name, group_name)
             )
             
-            row = cursor.fetchone()
-            if not row:
+            rows = cursor.fetchall()
+            if not rows:
                 return None
             
-            group_id = row[0]
-            
-            # Get pages for this content group
-            cursor.execute(
-                """
-                SELECT url, title, content
-                FROM pages
-                WHERE content_group_id = ?
-                """,
-                (group_id,)
-            )
-            
+            row = rows[0]
             pages = [
                 PageContent(
-                    url=page_row[0],
-                    title=page_row[1],
-                    content=page_row[2],
+                    url=page_row[2],
+                    title=page_row[3],
+                    content=page_row[4],
                     code_blocks=[]  # Code blocks not stored separately
                 )
-                for page_row in cursor.fetchall()
+                for page_row in rows
+                if page_row[2] is not None
             ]
             
             return ContentGroup(
-                name=row[1],
-                summary_markdown=row[2],
+                name=row[0],
+                summary_markdown=row[1],
                 pages=pages
             )
     
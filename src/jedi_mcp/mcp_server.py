@@ -18,6 +18,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Patterns for tool names and descriptions, compiled once at import
+_WHITESPACE_RE = re.compile(r'\s+')
+_TOOL_NAME_INVALID_RE = re.compile(r'[^a-z0-9_-]')
+_UNDERSCORES_RE = re.compile(r'_+')
+_HEADER_RE = re.compile(r'^#+\s+', re.MULTILINE)
+_CODE_FENCE_RE = re.compile(r'```[\s\S]*?```')
+_INLINE_CODE_RE = re.compile(r'`[^`]+`')
+
+# ASCII whitespace -> '_', other disallowed ASCII dropped, in one translate() pass
+_TOOL_NAME_TABLE = {
+    i: '_' if _WHITESPACE_RE.match(chr(i)) else None
+    for i in range(128)
+    if _TOOL_NAME_INVALID_RE.match(chr(i))
+}
+
 
 def sanitize_tool_name(name: str) -> str:
     """
@@ -31,17 +46,16 @@ def sanitize_tool_name(name: str) -> str:
     Returns:
         Sanitized tool name
     """
-    # Convert to lowercase
-    sanitized = name.lower()
-    
-    # Replace spaces with underscores, keep hyphens
-    sanitized = re.sub(r'\s+', '_', sanitized)
+    # Lowercase, replace spaces with underscores and remove special
+    # characters except underscores and hyphens
+    sanitized = name.lower().translate(_TOOL_NAME_TABLE)
     
-    # Remove special characters except underscores and hyphens
-    sanitized = re.sub(r'[^a-z0-9_-]', '', sanitized)
+    # Non-ASCII characters are left by the table; handle them with the regexes
+    if not sanitized.isascii():
+        sanitized = _TOOL_NAME_INVALID_RE.sub('', _WHITESPACE_RE.sub('_', sanitized))
     
     # Remove consecutive underscores
-    sanitized = re.sub(r'_+', '_', sanitized)
+    sanitized = _UNDERSCORES_RE.sub('_', sanitized)
     
     # Remove leading/trailing underscores and hyphens
     sanitized = sanitized.strip('_-')
@@ -68,13 +82,13 @@ def generate_tool_description(summary_markdown: str, max_length: int = 100) -> s
     description = summary_markdown.strip()
     
     # Remove markdown headers
-    description = re.sub(r'^#+\s+', '', description, flags=re.MULTILINE)
+    description = _HEADER_RE.sub('', description)
     
     # Remove code blocks
-    description = re.sub(r'```[\s\S]*?```', '', description)
+    description = _CODE_FENCE_RE.sub('', description)
     
     # Remove inline code
-    description = re.sub(r'`[^`]+`', '', description)
+    description = _INLINE_CODE_RE.sub('', description)
     
     # Remove extra whitespace
     description = ' '.join(description.split())
@@ -120,8 +134,9 @@ def create_mcp_server(
     logger.info(f"Initializing MCP server for project: {project_name}")
     
     try:
-        # Query database for all content groups
-        content_groups = db_manager.get_all_content_groups(project_name)
+        # Query database once for content group names and summaries; tools
+        # return the summary read here without touching the database again
+        content_groups = db_manager.get_content_group_summaries(project_name)
         
         if not content_groups:
             logger.warning(f"No content groups found for project: {project_name}")
@@ -133,49 +148,29 @@ def create_mcp_server(
         for group in content_groups:
             try:
                 # Sanitize tool name
-                tool_name = sanitize_tool_name(group.name)
+                tool_name = sanitize_tool_name(group['name'])
                 
                 # Generate tool description
-                description = generate_tool_description(group.summary_markdown)
+                description = generate_tool_description(group['summary_markdown'])
                 
                 # Create tool handler function with closure
-                def create_tool_handler(group_name: str, t_name: str):
-                    """Create a closure that captures the group name and tool name."""
+                def create_tool_handler(group_name: str, t_name: str, markdown: str):
+                    """Create a closure that captures the group's name, tool name and summary."""
                     @mcp.tool(name=t_name, description=description)
                     def tool_handler() -> str:
-                        """Tool handler that retrieves markdown from database."""
-                        try:
-                            logger.info(f"Tool invoked: {t_name} (group: {group_name})")
-                            
-                            # Retrieve content group from database
-                            content_group = db_manager.get_content_group_by_name(
-                                project_name,
-                                group_name
-                            )
-                            
-                            if content_group is None:
-                                error_msg = f"Content group '{group_name}' not found"
-                                logger.error(error_msg)
-                                return f"Error: {error_msg}"
-                            
-                            # Return markdown summary
-                            logger.debug(f"Returning markdown for group: {group_name}")
-                            return content_group.summary_markdown
-                            
-                        except Exception as e:
-                            error_msg = f"Error retrieving content for '{group_name}': {str(e)}"
-                            logger.error(error_msg, exc_info=True)
-                            return f"Error: {error_msg}"
+                        """Tool handler that returns the group's markdown summary."""
+                        logger.info(f"Tool invoked: {t_name} (group: {group_name})")
+                        return markdown
                     
                     return tool_handler
                 
                 # Register the tool with FastMCP using the decorator
-                create_tool_handler(group.name, tool_name)
+                create_tool_handler(group['name'], tool_name, group['summary_markdown'])
                 
                 logger.info(f"Registered tool: {tool_name} - {description}")
                 
             except Exception as e:
-                logger.error(f"Failed to register tool for group '{group.name}': {str(e)}", exc_info=True)
+                logger.error(f"Failed to register tool for group '{group['name']}': {str(e)}", exc_info=True)
                 # Continue registering other tools even if one fails
                 continue
         
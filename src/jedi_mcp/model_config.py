@@ -2,8 +2,6 @@
 
 import os
 from typing import Literal
-from strands.models.gemini import GeminiModel
-from strands.models import BedrockModel
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -46,6 +44,8 @@ def create_navigation_model():
     provider = get_model_provider()
     
     if provider == "gemini":
+        from strands.models.gemini import GeminiModel
+        
         model_id = os.environ.get("JEDI_NAVIGATION_MODEL", "gemini-2.0-flash-exp")
         return GeminiModel(
             client_args={
@@ -59,6 +59,8 @@ def create_navigation_model():
             }
         )
     else:  # bedrock
+        from strands.models import BedrockModel
+        
         model_id = os.environ.get("JEDI_NAVIGATION_MODEL", "qwen.qwen3-coder-30b-a3b-v1:0")
         return BedrockModel(
             model_id=model_id,
@@ -86,6 +88,8 @@ def create_content_processing_model():
     provider = get_model_provider()
     
     if provider == "gemini":
+        from strands.models.gemini import GeminiModel
+        
         model_id = os.environ.get("JEDI_CONTENT_MODEL", "gemini-2.0-flash-exp")
         return GeminiModel(
             client_args={
@@ -99,6 +103,8 @@ def create_content_processing_model():
             }
         )
     else:  # bedrock
+        from strands.models import BedrockModel
+        
         model_id = os.environ.get("JEDI_CONTENT_MODEL", "qwen.qwen3-coder-30b-a3b-v1:0")
         return BedrockModel(
             model_id=model_id,
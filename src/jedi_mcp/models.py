@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from typing import List, Optional, Dict
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentationLink:
     """Represents a documentation link extracted from navigation."""
     url: str
@@ -12,7 +12,7 @@ class DocumentationLink:
     category: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PageContent:
     """Represents the content of a crawled documentation page."""
     url: str
@@ -21,7 +21,7 @@ class PageContent:
     code_blocks: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ContentGroup:
     """Represents a logical grouping of related documentation pages."""
     name: str
@@ -29,7 +29,7 @@ class ContentGroup:
     pages: List[PageContent] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class CrawlConfig:
     """Configuration for documentation crawling behavior."""
     rate_limit_delay: float = 0.5
@@ -38,7 +38,7 @@ class CrawlConfig:
     custom_headers: Optional[Dict[str, str]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class GenerationResult:
     """Result of MCP server generation process."""
     success: bool
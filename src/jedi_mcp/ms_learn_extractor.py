@@ -5,11 +5,15 @@ that handles their collapsible tree navigation structure.
 """
 
 import asyncio
-from typing import List, Optional, Dict, Any
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+import logging
+from typing import Iterator, List, Optional, Dict, Any
+from urllib.parse import ParseResult, urlparse
+from lxml import etree
 
 from .models import DocumentationLink
+from ._sidebar_parser import fast_urljoin
+
+logger = logging.getLogger(__name__)
 
 # Try to import playwright for browser-based extraction
 try:
@@ -36,13 +40,15 @@ async def extract_ms_learn_navigation(url: str) -> List[DocumentationLink]:
     if not PLAYWRIGHT_AVAILABLE:
         raise ImportError("Playwright is required for Microsoft Learn extraction")
     
+    from .smart_navigation_extractor import CHROMIUM_LAUNCH_ARGS
+    
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
+        browser = await p.chromium.launch(headless=True, args=CHROMIUM_LAUNCH_ARGS)
         page = await browser.new_page()
         
         try:
             print(f"🌐 Loading Microsoft Learn page: {url}")
-            await page.goto(url, wait_until="networkidle", timeout=30000)
+            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
             
             # Wait for the tree navigation to load
             await page.wait_for_selector('ul.tree.table-of-contents', timeout=10000)
@@ -78,16 +84,16 @@ async def _expand_all_tree_sections(page) -> None:
     
     while iteration < max_iterations:
         iteration += 1
-        print(f"   Expansion iteration {iteration}...")
+        logger.debug(f"Expansion iteration {iteration}")
         
         # Find all collapsed tree items (not just expanders)
         collapsed_items = await page.query_selector_all('li[aria-expanded="false"]')
         
         if not collapsed_items:
-            print(f"   No more collapsed sections found")
+            logger.debug("No more collapsed sections found")
             break
         
-        print(f"   Found {len(collapsed_items)} collapsed sections")
+        logger.debug(f"Found {len(collapsed_items)} collapsed sections")
         
         expanded_count = 0
         for i, item in enumerate(collapsed_items):
@@ -95,7 +101,7 @@ async def _expand_all_tree_sections(page) -> None:
                 # Find the expander within this item
                 expander = await item.query_selector('.tree-expander')
                 if expander:
-                    print(f"   Expanding section {i+1}/{len(collapsed_items)}")
+                    logger.debug(f"Expanding section {i+1}/{len(collapsed_items)}")
                     
                     # Click the expander
                     await expander.click()
@@ -104,19 +110,18 @@ async def _expand_all_tree_sections(page) -> None:
                     # Wait for expansion animation
                     await page.wait_for_timeout(300)
                     
-                    # Verify expansion worked
-                    aria_expanded = await item.get_attribute('aria-expanded')
-                    if aria_expanded == 'true':
-                        print(f"     ✓ Successfully expanded")
-                    else:
-                        print(f"     ⚠ Expansion may have failed")
+                    # Verifying costs a browser round trip, so only do it when it is logged
+                    if logger.isEnabledFor(logging.DEBUG):
+                        aria_expanded = await item.get_attribute('aria-expanded')
+                        if aria_expanded != 'true':
+                            logger.debug(f"Section {i+1} may not have expanded")
                         
             except Exception as e:
-                print(f"   Warning: Could not expand section {i+1}: {e}")
+                logger.debug(f"Could not expand section {i+1}: {e}")
                 continue
         
         if expanded_count == 0:
-            print(f"   No sections were expanded in this iteration")
+            logger.debug("No sections were expanded in this iteration")
             break
         
         # Wait for any dynamic content to load after expansions
@@ -146,136 +151,171 @@ async def _expand_all_tree_sections(page) -> None:
         print(f"   After alternative method: {len(truly_final_collapsed)} sections still collapsed")
 
 
+def _has_class(name: str) -> str:
+    """XPath predicate matching elements whose class list contains name."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_HTML_PARSER = etree.HTMLParser(encoding='utf-8')
+
+# Compiled once; lxml runs these in C instead of walking the tree in Python
+_TREE_XPATH = etree.XPath("(//ul[contains(@class, 'tree') and contains(@class, 'table-of-contents')])[1]")
+_TREE_LINKS_XPATH = etree.XPath(f"descendant::a[{_has_class('tree-item')}][@href]")
+_NONE_ROLE_ITEMS_XPATH = etree.XPath("li[@role='none']")
+_CHILD_ITEMS_XPATH = etree.XPath("li")
+_CHILD_LINK_XPATH = etree.XPath(f"a[{_has_class('tree-item')}][1]")
+_CHILD_GROUP_XPATH = etree.XPath(f"ul[{_has_class('tree-group')}][1]")
+_CHILD_EXPANDER_XPATH = etree.XPath(f"span[{_has_class('tree-expander')}][1]")
+_EXPANDER_XPATH = etree.XPath(f"(descendant::span[{_has_class('tree-expander')}])[1]")
+_GROUP_XPATH = etree.XPath(f"(descendant::ul[{_has_class('tree-group')}])[1]")
+
+
+def _first(xpath: etree.XPath, element) -> Optional[Any]:
+    """First result of a compiled XPath, or None."""
+    results = xpath(element)
+    return results[0] if results else None
+
+
+def _text(element) -> str:
+    """Stripped text content of an element, joined like bs4's get_text(strip=True)."""
+    return ''.join(text.strip() for text in element.itertext())
+
+
 def _extract_links_from_expanded_tree(html_content: str, base_url: str) -> List[DocumentationLink]:
     """Extract links from the fully expanded Microsoft Learn tree navigation."""
     
-    soup = BeautifulSoup(html_content, 'lxml')
-    base_domain = urlparse(base_url).netloc
+    # Parse bytes with a fixed encoding so pages with an XML declaration are accepted
+    root = etree.HTML(html_content.encode('utf-8'), _HTML_PARSER)
+    # Parse the base URL once for every link in the tree
+    base_parsed = urlparse(base_url)
+    base_domain = base_parsed.netloc
     
     # Find the main tree navigation
-    tree = soup.find('ul', class_=lambda x: x and 'tree' in str(x) and 'table-of-contents' in str(x))
+    tree = _first(_TREE_XPATH, root) if root is not None else None
     
-    if not tree:
+    if tree is None:
         print("⚠️  Warning: Could not find tree navigation")
         return []
     
-    links = []
+    # Walk the tree structure, deduplicating as links are produced (first occurrence wins)
+    unique_links = {}
+    for link in _iter_tree_links(tree, base_url, base_parsed):
+        unique_links.setdefault(link.url, link)
+    
+    # Also extract any direct links in the tree (not in nested groups)
+    for link in _TREE_LINKS_XPATH(tree):
+        href = link.get('href', '')
+        title = _text(link)
+        
+        # Skip if already processed or invalid
+        if not title or href.startswith('#'):
+            continue
+        
+        # Check if this link is already in our list
+        absolute_url, link_domain = fast_urljoin(base_url, base_parsed, href)
+        if absolute_url in unique_links:
+            continue
+        
+        # Filter out external links
+        if link_domain and link_domain != base_domain:
+            continue
+        
+        # Try to determine category from parent structure
+        category = None
+        parent_li = next(link.iterancestors('li'), None)
+        if parent_li is not None:
+            # Look for a parent with tree-expander
+            parent_expander = next(parent_li.iterancestors('li'), None)
+            if parent_expander is not None:
+                expander_span = _first(_EXPANDER_XPATH, parent_expander)
+                if expander_span is not None:
+                    category = _text(expander_span)
+        
+        unique_links[absolute_url] = DocumentationLink(
+            url=absolute_url,
+            title=title,
+            category=category or 'Main'
+        )
+    
+    return list(unique_links.values())
+
+
+def _iter_tree_links(tree, base_url: str, base_parsed: ParseResult) -> Iterator[DocumentationLink]:
+    """Yield links from the tree navigation in document order, nested groups first."""
+    base_domain = base_parsed.netloc
     
-    # Extract links recursively from the tree structure
-    def extract_from_tree_node(node, parent_category=None, level=0):
-        """Recursively extract links from tree nodes."""
+    # Explicit stack of pending work: tree nodes to expand and links ready to yield
+    stack = [(tree, None)]
+    while stack:
+        node, parent_category = stack.pop()
+        if isinstance(node, DocumentationLink):
+            yield node
+            continue
+        
+        pending = []
         
         # Process direct child list items
-        for li in node.find_all('li', role='none', recursive=False):
+        for li in _NONE_ROLE_ITEMS_XPATH(node):
             # Check if this li contains a direct link
-            link = li.find('a', class_='tree-item', recursive=False)
+            link = _first(_CHILD_LINK_XPATH, li)
             
-            if link and link.get('href'):
+            if link is not None and link.get('href'):
                 # This is a leaf node with a link
                 href = link.get('href', '')
-                title = link.get_text(strip=True)
+                title = _text(link)
                 
                 # Skip empty titles or anchor-only links
                 if not title or href.startswith('#'):
                     continue
                 
                 # Resolve relative URLs
-                absolute_url = urljoin(base_url, href)
+                absolute_url, link_domain = fast_urljoin(base_url, base_parsed, href)
                 
                 # Filter out external links
-                link_domain = urlparse(absolute_url).netloc
                 if link_domain and link_domain != base_domain:
                     continue
                 
                 # Create documentation link
-                doc_link = DocumentationLink(
+                pending.append((DocumentationLink(
                     url=absolute_url,
                     title=title,
                     category=parent_category
-                )
-                links.append(doc_link)
+                ), None))
             
             # Check if this li has nested content (tree-group)
-            nested_group = li.find('ul', class_='tree-group', recursive=False)
-            if nested_group:
+            nested_group = _first(_CHILD_GROUP_XPATH, li)
+            if nested_group is not None:
                 # This li might have a category name from a tree-expander
                 category_name = parent_category
                 
                 # Try to get category name from tree-expander span
-                expander = li.find('span', class_='tree-expander', recursive=False)
-                if expander:
+                expander = _first(_CHILD_EXPANDER_XPATH, li)
+                if expander is not None:
                     # Get text from the expander, excluding the indicator
-                    expander_text = expander.get_text(strip=True)
+                    expander_text = _text(expander)
                     # Remove the chevron indicator text if present
                     if expander_text and len(expander_text) > 1:
                         category_name = expander_text
                 
-                # Recursively process the nested group
-                extract_from_tree_node(nested_group, category_name, level + 1)
+                # Process the nested group right after this item
+                pending.append((nested_group, category_name))
         
         # Also process tree items that are not in li elements (direct children)
-        for tree_item in node.find_all('li', recursive=False):
+        for tree_item in _CHILD_ITEMS_XPATH(node):
             # Check if this is a tree item with aria-level (Microsoft Learn pattern)
             if tree_item.get('role') == 'treeitem':
                 # This is a category/section header
-                expander = tree_item.find('span', class_='tree-expander')
-                if expander:
-                    category_name = expander.get_text(strip=True)
+                expander = _first(_EXPANDER_XPATH, tree_item)
+                if expander is not None:
+                    category_name = _text(expander)
                     
                     # Look for nested ul with tree-group class
-                    nested_ul = tree_item.find('ul', class_='tree-group')
-                    if nested_ul:
-                        extract_from_tree_node(nested_ul, category_name, level + 1)
-    
-    # Start extraction from the root tree
-    extract_from_tree_node(tree)
-    
-    # Also extract any direct links in the tree (not in nested groups)
-    for link in tree.find_all('a', class_='tree-item', href=True):
-        href = link.get('href', '')
-        title = link.get_text(strip=True)
-        
-        # Skip if already processed or invalid
-        if not title or href.startswith('#'):
-            continue
+                    nested_ul = _first(_GROUP_XPATH, tree_item)
+                    if nested_ul is not None:
+                        pending.append((nested_ul, category_name))
         
-        # Check if this link is already in our list
-        absolute_url = urljoin(base_url, href)
-        if any(existing.url == absolute_url for existing in links):
-            continue
-        
-        # Filter out external links
-        link_domain = urlparse(absolute_url).netloc
-        if link_domain and link_domain != base_domain:
-            continue
-        
-        # Try to determine category from parent structure
-        category = None
-        parent_li = link.find_parent('li')
-        if parent_li:
-            # Look for a parent with tree-expander
-            parent_expander = parent_li.find_parent('li')
-            if parent_expander:
-                expander_span = parent_expander.find('span', class_='tree-expander')
-                if expander_span:
-                    category = expander_span.get_text(strip=True)
-        
-        doc_link = DocumentationLink(
-            url=absolute_url,
-            title=title,
-            category=category or 'Main'
-        )
-        links.append(doc_link)
-    
-    # Remove duplicates while preserving order
-    seen_urls = set()
-    unique_links = []
-    for link in links:
-        if link.url not in seen_urls:
-            seen_urls.add(link.url)
-            unique_links.append(link)
-    
-    return unique_links
+        # Reversed so the first pending entry is handled next
+        stack.extend(reversed(pending))
 
 
 def is_microsoft_learn_url(url: str) -> bool:
@@ -6,26 +6,73 @@ This module provides navigation extraction with two approaches:
 """
 
 import asyncio
-from typing import List, Optional
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
-from strands import Agent
+import concurrent.futures
+import functools
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import sys
+from collections import OrderedDict
+from dataclasses import replace
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
 
 from .models import DocumentationLink
-from .model_config import create_navigation_model
-
-# Try to import playwright for browser-based extraction
+from ._sidebar_parser import (
+    find_sidebar as _find_sidebar,
+    extract_links_from_sidebar as _extract_links_from_sidebar,
+    canonical_url,
+    fast_urljoin,
+    is_blocked_url,
+    NAV_STRAINER,
+)
+
+# orjson is an optional speedup for parsing model responses
 try:
-    from playwright.async_api import async_playwright
-    PLAYWRIGHT_AVAILABLE = True
+    import orjson
 except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+    orjson = None
+
+# Playwright is only imported when browser extraction actually runs
+PLAYWRIGHT_AVAILABLE = importlib.util.find_spec("playwright") is not None
+
+# Strands Agent class, imported on first use of the AI fallback
+Agent = None
+
+# Heuristic links found without a sidebar skip the AI fallback when at least
+# this many are found and some have a category
+_MIN_HEURISTIC_LINKS = 3
+
+# Category given to heuristic links outside any heading
+_DEFAULT_CATEGORY = 'Main Documentation'
+
+# AI fallback results by (provider, model, base URL, navigation HTML digest),
+# least recently used evicted first
+AI_NAVIGATION_CACHE_SIZE = 256
+_ai_navigation_cache: "OrderedDict[Tuple[str, Optional[str], str, str], Tuple[DocumentationLink, ...]]" = OrderedDict()
+
+
+def _ai_fallback_enabled() -> bool:
+    """
+    Check whether the AI navigation fallback has been opted into.
+    
+    Environment Variables:
+        JEDI_ENABLE_AI_FALLBACK: Set to 1 to use the AI model when no sidebar is found
+    """
+    return os.environ.get("JEDI_ENABLE_AI_FALLBACK", "0") == "1"
 
 
 async def extract_navigation_links_async(base_url: str) -> List[DocumentationLink]:
     """
     Async version of navigation extraction using browser-based extraction.
     
+    Browsers stay open in a shared pool between calls; await
+    close_browser_pool() once extraction is finished.
+    
     Args:
         base_url: Base URL for the documentation site
         
@@ -35,6 +82,14 @@ async def extract_navigation_links_async(base_url: str) -> List[DocumentationLin
     return await _extract_with_browser(base_url)
 
 
+async def close_browser_pool() -> None:
+    """Close browsers kept open by browser-based extraction, if any were started."""
+    # Only the browser path imports the smart extractor (and playwright)
+    smart_extractor = sys.modules.get(f"{__package__}.smart_navigation_extractor")
+    if smart_extractor is not None:
+        await smart_extractor.close_pool()
+
+
 def extract_navigation_links(html_content: str, base_url: str, use_browser: bool = False) -> List[DocumentationLink]:
     """
     Extract documentation links from navigation/sidebar elements.
@@ -56,7 +111,7 @@ def extract_navigation_links(html_content: str, base_url: str, use_browser: bool
     # If browser mode requested and available, use smart extraction
     if use_browser and PLAYWRIGHT_AVAILABLE:
         try:
-            return asyncio.run(_extract_with_browser(base_url))
+            return _run_coroutine_sync(_extract_with_browser_once(base_url))
         except Exception as e:
             print(f"⚠️  Browser extraction failed: {e}")
             print("   Falling back to HTML parsing...")
@@ -65,6 +120,38 @@ def extract_navigation_links(html_content: str, base_url: str, use_browser: bool
     return _extract_from_html_smart(html_content, base_url)
 
 
+def _run_coroutine_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+    
+    asyncio.run() refuses to start while another event loop is running in this
+    thread (Jupyter, MCP servers, web frameworks). In that case the coroutine
+    runs on a fresh loop in a worker thread instead. Callers that already have
+    a loop should await extract_navigation_links_async() directly.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+async def _extract_with_browser_once(url: str) -> List[DocumentationLink]:
+    """Run browser extraction and shut the browser pool down afterwards."""
+    try:
+        return await _extract_with_browser(url)
+    finally:
+        await close_browser_pool()
+
+
 async def _extract_with_browser(url: str) -> List[DocumentationLink]:
     """Extract navigation using headless browser with site-specific support."""
     # Check if this is a Microsoft Learn URL (requires specialized extraction)
@@ -75,9 +162,10 @@ async def _extract_with_browser(url: str) -> List[DocumentationLink]:
             print(f"⚠️  Microsoft Learn extraction failed: {e}")
             print("   Falling back to smart navigation extraction...")
     
-    # Fallback to smart navigation extractor for all other sites
+    # Fallback to smart navigation extractor for all other sites; browser mode
+    # was requested explicitly, so always render rather than trust static HTML
     from .smart_navigation_extractor import extract_navigation_smart
-    return await extract_navigation_smart(url)
+    return await extract_navigation_smart(url, force_render=True)
 
 
 def _extract_from_html_smart(html_content: str, base_url: str) -> List[DocumentationLink]:
@@ -86,14 +174,22 @@ def _extract_from_html_smart(html_content: str, base_url: str) -> List[Documenta
     
     This is the primary extraction method that works for most documentation sites.
     """
-    soup = BeautifulSoup(html_content, 'lxml')
+    # Only build the nav/aside/sidebar-like parts of the page, plus the
+    # menu/toc elements the link heuristics read if no sidebar is found
+    soup = BeautifulSoup(html_content, 'lxml', parse_only=_NAVIGATION_STRAINER)
     
     # Find sidebar
     sidebar = _find_sidebar(soup)
     
     if not sidebar:
-        print("⚠️  Warning: Could not find sidebar navigation, using AI fallback")
-        return _extract_with_ai(html_content, base_url)
+        # The heuristics are cheap on the soup already built; a categorized
+        # result makes the model call unnecessary
+        heuristic_links = _links_from_data(_fallback_link_extraction(soup, base_url), base_url)
+        if _ai_fallback_enabled() and not _is_structured(heuristic_links):
+            print("⚠️  Warning: Could not find sidebar navigation, using AI fallback")
+            return _extract_with_ai(html_content, base_url)
+        print("⚠️  Warning: Could not find sidebar navigation, using link heuristics")
+        return heuristic_links
     
     # Extract links using smart parsing
     links = _extract_links_from_sidebar(sidebar, base_url)
@@ -101,79 +197,22 @@ def _extract_from_html_smart(html_content: str, base_url: str) -> List[Documenta
     return links
 
 
-def _find_sidebar(soup: BeautifulSoup):
-    """Find the main sidebar/navigation element."""
-    
-    # Try common sidebar patterns with priority order
-    patterns = [
-        # Material for MkDocs pattern (div with md-sidebar class)
-        {'name': ['div'], 'class_': lambda x: x and 'md-sidebar' in str(x) and 'primary' in str(x)},
-        # Docusaurus pattern (aside with sidebar class)
-        {'name': ['aside'], 'class_': lambda x: x and 'sidebar' in str(x).lower() and 'banner' not in str(x).lower()},
-        # Generic sidebar patterns (div/nav/aside with sidebar-related classes)
-        {'name': ['div', 'nav', 'aside'], 'class_': lambda x: x and any(
-            term in str(x).lower() for term in ['sidebar', 'side-nav', 'sidenav', 'docs-nav', 'doc-nav']
-        ) and 'banner' not in str(x).lower()},
-        # ID-based patterns
-        {'name': ['aside', 'nav', 'div'], 'id': lambda x: x and any(
-            term in str(x).lower() for term in ['sidebar', 'navigation', 'nav', 'menu']
-        )},
-    ]
-    
-    for pattern in patterns:
-        sidebar = soup.find(**pattern)
-        if sidebar:
-            # Verify it has a reasonable number of links (at least 5)
-            links = sidebar.find_all('a', href=True)
-            if len(links) >= 5:
-                return sidebar
-    
-    # Fallback: find any nav or aside (but not banners)
-    for elem in soup.find_all(['nav', 'aside']):
-        classes = ' '.join(elem.get('class', [])).lower()
-        if 'banner' not in classes:
-            links = elem.find_all('a', href=True)
-            if len(links) >= 5:
-                return elem
-    
-    return None
-
-
-def _extract_links_from_sidebar(sidebar, base_url: str) -> List[DocumentationLink]:
-    """Extract links from sidebar with category information."""
-    base_domain = urlparse(base_url).netloc
-    
-    # Check if this is a Docusaurus-style sidebar
-    if _is_docusaurus_sidebar(sidebar):
-        links = _extract_docusaurus_links(sidebar, base_url, base_domain)
-    # Check if this is a Material for MkDocs sidebar
-    elif _is_material_mkdocs_sidebar(sidebar):
-        links = _extract_material_mkdocs_links(sidebar, base_url, base_domain)
-    else:
-        # Generic extraction
-        links = _extract_generic_links(sidebar, base_url, base_domain)
-    
-    # Remove duplicates while preserving order
-    seen_urls = set()
-    unique_links = []
-    for link in links:
-        if link.url not in seen_urls:
-            seen_urls.add(link.url)
-            unique_links.append(link)
+def _is_structured(links: List[DocumentationLink]) -> bool:
+    """
+    Check whether heuristic links look like a well-structured navigation menu.
     
-    return unique_links
-
-
-def _is_docusaurus_sidebar(sidebar) -> bool:
-    """Check if this is a Docusaurus-style sidebar."""
-    return bool(sidebar.find(class_=lambda x: x and 'theme-doc-sidebar' in str(x)))
-
-
-def _is_material_mkdocs_sidebar(sidebar) -> bool:
-    """Check if this is a Material for MkDocs sidebar."""
-    # Material for MkDocs uses md-sidebar and md-nav classes
-    classes = ' '.join(sidebar.get('class', []))
-    return 'md-sidebar' in classes or bool(sidebar.find(class_=lambda x: x and 'md-nav' in str(x)))
+    Args:
+        links: Links found by the link heuristics
+        
+    Returns:
+        True if there are at least _MIN_HEURISTIC_LINKS titled links and at
+        least one of them sits under a real category heading
+    """
+    return (
+        len(links) >= _MIN_HEURISTIC_LINKS
+        and all(link.title for link in links)
+        and any(link.category != _DEFAULT_CATEGORY for link in links)
+    )
 
 
 def _is_microsoft_learn_url(url: str) -> bool:
@@ -188,193 +227,7 @@ async def _extract_microsoft_learn_navigation(url: str) -> List[DocumentationLin
     return await extract_ms_learn_navigation(url)
 
 
-def _extract_material_mkdocs_links(sidebar, base_url: str, base_domain: str) -> List[DocumentationLink]:
-    """Extract links from Material for MkDocs sidebar."""
-    links = []
-    
-    # Find the main navigation
-    nav = sidebar.find('nav', class_='md-nav')
-    if not nav:
-        return links
-    
-    # Find all top-level list items
-    ul = nav.find('ul', class_='md-nav__list')
-    if not ul:
-        return links
-    
-    def extract_from_nav_item(item, parent_category=None):
-        """Recursively extract links from a nav item."""
-        item_links = []
-        
-        # Check if this is a nested item (has children)
-        is_nested = 'md-nav__item--nested' in ' '.join(item.get('class', []))
-        
-        if is_nested:
-            # Get the category name from the link or label
-            category_link = item.find('a', class_='md-nav__link', recursive=False)
-            if not category_link:
-                # Try to find it in the container
-                container = item.find('div', class_='md-nav__link')
-                if container:
-                    category_link = container.find('a', class_='md-nav__link')
-            
-            category_name = None
-            if category_link:
-                category_name = category_link.get_text(strip=True)
-                # Add the category link itself
-                doc_link = _create_doc_link(category_link, base_url, base_domain, parent_category)
-                if doc_link:
-                    item_links.append(doc_link)
-            
-            # Find nested navigation
-            nested_nav = item.find('nav', class_='md-nav')
-            if nested_nav:
-                # Find the nested ul inside the nav
-                nested_ul = nested_nav.find('ul', class_='md-nav__list')
-                if nested_ul:
-                    nested_items = nested_ul.find_all('li', class_='md-nav__item', recursive=False)
-                    for nested_item in nested_items:
-                        item_links.extend(extract_from_nav_item(nested_item, category_name or parent_category))
-        else:
-            # This is a regular link item
-            link = item.find('a', class_='md-nav__link', recursive=False)
-            if link:
-                doc_link = _create_doc_link(link, base_url, base_domain, parent_category)
-                if doc_link:
-                    item_links.append(doc_link)
-        
-        return item_links
-    
-    # Process all top-level items
-    top_level_items = ul.find_all('li', class_='md-nav__item', recursive=False)
-    for item in top_level_items:
-        links.extend(extract_from_nav_item(item))
-    
-    return links
-
-
-def _extract_docusaurus_links(sidebar, base_url: str, base_domain: str) -> List[DocumentationLink]:
-    """Extract links from Docusaurus-style sidebar."""
-    links = []
-    
-    # Find all list items
-    list_items = sidebar.find_all('li', class_=lambda x: x and 'theme-doc-sidebar-item' in str(x))
-    
-    current_category = None
-    
-    for item in list_items:
-        # Check if this is a category item
-        if 'theme-doc-sidebar-item-category' in ' '.join(item.get('class', [])):
-            # This is a category - get the category name
-            category_link = item.find('a', class_=lambda x: x and 'menu__link--sublist' in str(x))
-            if category_link:
-                current_category = category_link.get_text(strip=True)
-            
-            # Extract nested links under this category
-            nested_ul = item.find('ul', class_='menu__list')
-            if nested_ul:
-                nested_items = nested_ul.find_all('li', recursive=False)
-                for nested_item in nested_items:
-                    link = nested_item.find('a', href=True)
-                    if link:
-                        doc_link = _create_doc_link(link, base_url, base_domain, current_category)
-                        if doc_link:
-                            links.append(doc_link)
-        
-        # Check if this is a regular link item (not a category)
-        elif 'theme-doc-sidebar-item-link' in ' '.join(item.get('class', [])):
-            link = item.find('a', href=True, recursive=False)
-            if link:
-                doc_link = _create_doc_link(link, base_url, base_domain, None)
-                if doc_link:
-                    links.append(doc_link)
-    
-    return links
-
-
-def _extract_generic_links(sidebar, base_url: str, base_domain: str) -> List[DocumentationLink]:
-    """Extract links from generic sidebar structure."""
-    links = []
-    
-    # Find all links in the sidebar
-    all_links = sidebar.find_all('a', href=True)
-    
-    for link in all_links:
-        # Try to determine category from parent structure
-        category = None
-        
-        # Look for parent heading
-        parent = link.find_parent(['li', 'div', 'section'])
-        if parent:
-            # Look for a heading in the parent or previous siblings
-            heading = parent.find_previous(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-            if heading:
-                heading_text = heading.get_text(strip=True)
-                # Only use as category if it's reasonably short
-                if len(heading_text) < 50:
-                    category = heading_text
-        
-        doc_link = _create_doc_link(link, base_url, base_domain, category)
-        if doc_link:
-            links.append(doc_link)
-    
-    return links
-
-
-def _create_doc_link(link_tag, base_url: str, base_domain: str, category: Optional[str]) -> Optional[DocumentationLink]:
-    """Create a DocumentationLink from an anchor tag."""
-    href = link_tag.get('href', '')
-    title = link_tag.get_text(strip=True) or link_tag.get('title', '')
-    
-    # Skip empty or anchor-only links
-    if not href or not title or href.startswith('#'):
-        return None
-    
-    # Resolve relative URLs
-    absolute_url = urljoin(base_url, href)
-    
-    # Filter out external links
-    link_domain = urlparse(absolute_url).netloc
-    if link_domain and link_domain != base_domain:
-        return None
-    
-    # Filter out non-documentation patterns
-    url_lower = absolute_url.lower()
-    if any(pattern in url_lower for pattern in [
-        'twitter.com', 'facebook.com', 'linkedin.com', 'github.com',
-        'discord.com', 'slack.com', 'youtube.com',
-        '/login', '/signup', '/register', '/auth',
-        '/search', '?search=', '/download',
-        'mailto:', 'tel:', 'javascript:'
-    ]):
-        return None
-    
-    return DocumentationLink(
-        url=absolute_url,
-        title=title,
-        category=category
-    )
-
-
-def _extract_with_ai(html_content: str, base_url: str) -> List[DocumentationLink]:
-    """Fallback: Extract navigation using AI when smart parsing fails."""
-    
-    soup = BeautifulSoup(html_content, 'lxml')
-    
-    # Extract navigation HTML
-    nav_elements = soup.find_all(['nav', 'aside'])
-    nav_html = '\n'.join(str(elem) for elem in nav_elements[:3])
-    
-    if not nav_html.strip():
-        nav_html = str(soup)
-    
-    # Create model for navigation extraction
-    model = create_navigation_model()
-
-    # Create AI agent to analyze navigation
-    agent = Agent(
-        model=model,
-        system_prompt="""You are a documentation navigation analyzer. Your task is to extract ALL documentation links from the sidebar/navigation menu.
+_NAVIGATION_SYSTEM_PROMPT = """You are a documentation navigation analyzer. Your task is to extract ALL documentation links from the sidebar/navigation menu.
 
 CRITICAL INSTRUCTIONS:
 1. Focus ONLY on the main documentation sidebar/navigation menu (usually on the left side)
@@ -406,7 +259,64 @@ Return a JSON array of objects with this structure:
 ]
 
 IMPORTANT: Extract ALL links from the sidebar navigation tree, not just top-level items. If you see categories like "Core Concepts", "Advanced Topics", etc., extract all the links under each category."""
+
+
+@functools.lru_cache(maxsize=8)
+def _get_ai_agent(provider: str, model_id: Optional[str]):
+    """
+    Build the navigation agent once per model setting and reuse it for every AI fallback call.
+    
+    The model itself is configured from the environment by
+    create_navigation_model(); the arguments only key the cache, so changing
+    JEDI_MODEL_PROVIDER or JEDI_NAVIGATION_MODEL builds a new agent.
+    
+    Args:
+        provider: Configured model provider
+        model_id: Configured navigation model ID, or None for the provider default
+    
+    Returns:
+        Strands Agent configured with the navigation model and system prompt
+    """
+    # Import the AI stack only when the fallback is actually used
+    global Agent
+    if Agent is None:
+        from strands import Agent
+    from .model_config import create_navigation_model
+    
+    return Agent(
+        model=create_navigation_model(),
+        system_prompt=_NAVIGATION_SYSTEM_PROMPT
     )
+
+
+def _extract_with_ai(html_content: str, base_url: str) -> List[DocumentationLink]:
+    """Fallback: Extract navigation using AI when smart parsing fails."""
+    
+    # Extract navigation HTML without building a DOM for the whole page
+    nav_html = _collect_nav_html(html_content, max_chars=15000)
+    
+    soup = None
+    if not nav_html.strip():
+        soup = BeautifulSoup(html_content, 'lxml')
+        nav_html = str(soup)
+    
+    # Only this much of the navigation is sent to the model
+    nav_html = nav_html[:15000]
+    
+    # The same navigation sent to the same model gives the same answer, so
+    # repeat crawls of an unchanged site skip the model call
+    from .model_config import get_model_provider
+    provider = get_model_provider()
+    model_id = os.environ.get("JEDI_NAVIGATION_MODEL")
+    cache_key = (provider, model_id, base_url, hashlib.sha1(nav_html.encode('utf-8')).hexdigest())
+    cached = _ai_navigation_cache.get(cache_key)
+    if cached is not None:
+        _ai_navigation_cache.move_to_end(cache_key)
+        return [replace(link) for link in cached]
+    
+    agent = _get_ai_agent(provider, model_id)
+    # The agent is reused, so drop the conversation from any previous page
+    agent.messages = []
     
     # Use agent to extract links
     prompt = f"""Analyze this HTML navigation structure and extract ALL documentation links from the SIDEBAR MENU.
@@ -420,32 +330,118 @@ INSTRUCTIONS:
 4. Ignore header navigation, version dropdowns, and footer links
 
 HTML Navigation Structure:
-{nav_html[:15000]}
+{nav_html}
 
 Return ONLY a JSON array with ALL sidebar documentation links. No other text."""
     
     response = agent(prompt)
     
     # Parse agent response
-    import json
     try:
-        # Extract JSON from response
-        response_text = str(response)
-        # Find JSON array in response
-        start_idx = response_text.find('[')
-        end_idx = response_text.rfind(']') + 1
-        if start_idx >= 0 and end_idx > start_idx:
-            json_str = response_text[start_idx:end_idx]
-            links_data = json.loads(json_str)
-        else:
-            links_data = []
-    except (json.JSONDecodeError, ValueError):
+        links_data = _parse_agent_json(str(response))
+    except ValueError:
         # Fallback: extract links manually
-        links_data = _fallback_link_extraction(soup, base_url)
+        if soup is None:
+            soup = BeautifulSoup(html_content, 'lxml', parse_only=_FALLBACK_STRAINER)
+        return _links_from_data(_fallback_link_extraction(soup, base_url), base_url)
+    
+    links = _links_from_data(links_data, base_url)
+    if links:
+        _ai_navigation_cache[cache_key] = tuple(replace(link) for link in links)
+        if len(_ai_navigation_cache) > AI_NAVIGATION_CACHE_SIZE:
+            _ai_navigation_cache.popitem(last=False)
+    return links
+
+
+def clear_ai_navigation_cache() -> None:
+    """Forget navigation results memoized by the AI fallback."""
+    _ai_navigation_cache.clear()
+
+
+def _parse_agent_json(response_text: str) -> List[dict]:
+    """
+    Parse the JSON array of links out of a model response.
+    
+    Args:
+        response_text: Raw text returned by the agent
+        
+    Returns:
+        List of link dictionaries, empty if the response holds no JSON array
+        
+    Raises:
+        ValueError: If the bracketed section is not valid JSON
+    """
+    response_bytes = response_text.encode('utf-8')
+    start_idx = response_bytes.find(b'[')
+    end_idx = response_bytes.rfind(b']') + 1
+    if start_idx < 0 or end_idx <= start_idx:
+        return []
+    
+    json_bytes = response_bytes[start_idx:end_idx]
+    if orjson is not None:
+        data = orjson.loads(json_bytes)
+    else:
+        data = json.loads(json_bytes)
+    
+    if not isinstance(data, list):
+        return []
+    return [item for item in data if isinstance(item, dict)]
+
+
+def _collect_nav_html(html_content: str, max_chars: int, max_regions: int = 3) -> str:
+    """
+    Stream the page and serialize only its outermost nav/aside regions.
+    
+    Args:
+        html_content: HTML content of the page
+        max_chars: Stop once this many characters of navigation HTML are collected
+        max_regions: Maximum number of nav/aside regions to keep
+        
+    Returns:
+        Concatenated navigation HTML, or an empty string if none was found
+    """
+    regions = []
+    total = 0
+    try:
+        for _, elem in etree.iterparse(
+            io.BytesIO(html_content.encode('utf-8')),
+            events=('end',),
+            tag=('nav', 'aside'),
+            html=True,
+            encoding='utf-8'
+        ):
+            # Nested regions are serialized as part of their outer nav/aside
+            if any(ancestor.tag in ('nav', 'aside') for ancestor in elem.iterancestors()):
+                continue
+            
+            region = etree.tostring(elem, encoding='unicode', with_tail=False)
+            elem.clear()
+            regions.append(region[:max_chars - total])
+            total += len(regions[-1])
+            if len(regions) >= max_regions or total >= max_chars:
+                break
+    except etree.LxmlError:
+        # Empty or unparseable input: let the caller fall back to a full parse
+        pass
+    
+    return '\n'.join(regions)
+
+
+def _links_from_data(links_data: List[dict], base_url: str) -> List[DocumentationLink]:
+    """
+    Convert raw link dictionaries into filtered, deduplicated DocumentationLinks.
     
-    # Process and filter links
-    base_domain = urlparse(base_url).netloc
-    documentation_links = []
+    Args:
+        links_data: Dictionaries with url, title, and category keys
+        base_url: Base URL for resolving relative links
+        
+    Returns:
+        List of same-domain documentation links in first-seen order
+    """
+    base_parsed = urlparse(base_url)
+    base_domain = base_parsed.netloc
+    # Keyed by canonical URL so filtering and deduplication happen in a single pass
+    documentation_links = {}
     
     for link_data in links_data:
         url = link_data.get('url', '')
@@ -453,22 +449,19 @@ Return ONLY a JSON array with ALL sidebar documentation links. No other text."""
             continue
             
         # Resolve relative URLs
-        absolute_url = urljoin(base_url, url)
+        absolute_url, link_domain = fast_urljoin(base_url, base_parsed, url)
         
         # Filter out external links (different domain)
-        link_domain = urlparse(absolute_url).netloc
         if link_domain and link_domain != base_domain:
             continue
         
+        # Keep the first occurrence of each page
+        key = canonical_url(absolute_url)
+        if key in documentation_links:
+            continue
+        
         # Filter out non-documentation patterns
-        url_lower = absolute_url.lower()
-        if any(pattern in url_lower for pattern in [
-            'twitter.com', 'facebook.com', 'linkedin.com', 'github.com',
-            'discord.com', 'slack.com', 'youtube.com',
-            '/login', '/signup', '/register', '/auth',
-            '/search', '?search=', '/download',
-            'mailto:', 'tel:', 'javascript:'
-        ]):
+        if is_blocked_url(absolute_url):
             continue
         
         # Create DocumentationLink
@@ -477,17 +470,60 @@ Return ONLY a JSON array with ALL sidebar documentation links. No other text."""
             title=link_data.get('title'),
             category=link_data.get('category')
         )
-        documentation_links.append(doc_link)
+        documentation_links[key] = doc_link
     
-    # Remove duplicates while preserving order
-    seen_urls = set()
-    unique_links = []
-    for link in documentation_links:
-        if link.url not in seen_urls:
-            seen_urls.add(link.url)
-            unique_links.append(link)
+    return list(documentation_links.values())
+
+
+# Class fragments that make an element a fallback link source, besides nav/aside
+_FALLBACK_CLASS_TERMS = ('nav', 'sidebar', 'menu', 'toc')
+
+
+class _FallbackStrainer(SoupStrainer):
+    """
+    Parse-time filter that only builds the elements _fallback_link_extraction reads.
+    
+    Keeps every nav/aside element and any element whose class contains one of
+    _FALLBACK_CLASS_TERMS, together with their full subtrees. On Beautiful
+    Soup versions without the allow_tag_creation hook every tag is kept.
+    """
+    
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        if name in ('nav', 'aside'):
+            return True
+        if not attrs:
+            return False
+        
+        classes = attrs.get('class') or ''
+        if not isinstance(classes, str):
+            classes = ' '.join(classes)
+        classes = classes.lower()
+        return any(term in classes for term in _FALLBACK_CLASS_TERMS)
+
+
+# Pass as parse_only when a soup is built only for _fallback_link_extraction
+_FALLBACK_STRAINER = _FallbackStrainer()
+
+
+class _NavigationStrainer(SoupStrainer):
+    """
+    Parse-time filter keeping what either NAV_STRAINER or _FALLBACK_STRAINER keeps.
+    
+    One parse then serves both find_sidebar and, when no sidebar is found,
+    _fallback_link_extraction. On Beautiful Soup versions without the
+    allow_tag_creation hook every tag is kept.
+    """
     
-    return unique_links
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        # Most tags are settled by the fallback rules; every sidebar class
+        # term contains 'nav' or 'sidebar', so only divs with a sidebar-like
+        # id still need NAV_STRAINER
+        if _FALLBACK_STRAINER.allow_tag_creation(nsprefix, name, attrs):
+            return True
+        return name == 'div' and bool(attrs) and NAV_STRAINER.allow_tag_creation(nsprefix, name, attrs)
+
+
+_NAVIGATION_STRAINER = _NavigationStrainer()
 
 
 def _fallback_link_extraction(soup: BeautifulSoup, base_url: str) -> List[dict]:
@@ -502,14 +538,21 @@ def _fallback_link_extraction(soup: BeautifulSoup, base_url: str) -> List[dict]:
         List of dictionaries with url, title, and category
     """
     links = []
+    # Every href already added to links
+    seen_hrefs = set()
     
     # Find all links in navigation elements
     nav_elements = soup.find_all(['nav', 'aside'])
     nav_elements.extend(soup.find_all(class_=lambda x: x and any(
-        term in str(x).lower() for term in ['nav', 'sidebar', 'menu', 'toc']
+        term in str(x).lower() for term in _FALLBACK_CLASS_TERMS
     )))
     
     for nav_elem in nav_elements:
+        # Menus often give every item a nav/menu class, so most candidates sit
+        # inside one already read; skip those with no new links to offer
+        if all(a_tag['href'] in seen_hrefs for a_tag in nav_elem.find_all('a', href=True)):
+            continue
+        
         # Look for hierarchical structure (lists, sections, etc.)
         # Try to find category containers
         categories = nav_elem.find_all(['section', 'div', 'ul'], class_=lambda x: x and any(
@@ -546,7 +589,8 @@ def _fallback_link_extraction(soup: BeautifulSoup, base_url: str) -> List[dict]:
                 links.append({
                     'url': href,
                     'title': title,
-                    'category': category or 'Main Documentation'
+                    'category': category or _DEFAULT_CATEGORY
                 })
+                seen_hrefs.add(href)
     
     return links
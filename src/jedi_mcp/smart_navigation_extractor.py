@@ -1,331 +1,538 @@
 """Smart navigation extraction using headless browser and DOM parsing."""
 
 import asyncio
-from typing import List, Optional
-from urllib.parse import urljoin, urlparse
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, Browser, TimeoutError as PlaywrightTimeoutError
 
 from .models import DocumentationLink
+from ._sidebar_parser import (
+    find_sidebar as _find_sidebar,
+    extract_links_from_sidebar as _extract_links_from_sidebar,
+    NAV_STRAINER,
+)
+
+
+# Resource types that do not affect the navigation DOM
+_BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# Analytics and ad hosts whose scripts and beacons never build navigation
+_TRACKER_HOST_RE = re.compile(
+    r'(?:^|\.)(?:google-analytics\.com|googletagmanager\.com|doubleclick\.net'
+    r'|hotjar\.com|segment\.com|segment\.io)$'
+)
+
+# Matches once a recognisable documentation sidebar is in the DOM
+SIDEBAR_SIGNAL_SELECTOR = (
+    'aside.sidebar, aside.theme-doc-sidebar-container, div.md-sidebar--primary, '
+    'nav.md-nav, [class*="sidebar"] a[href]'
+)
+
+# On-disk cache of rendered pages
+HTML_CACHE_DIR = Path.home() / ".jedi-mcp" / "html-cache"
+HTML_CACHE_TTL = 24 * 60 * 60  # seconds
+HTML_CACHE_MAX_BYTES = 256 * 1024 * 1024  # oldest files are pruned past this size
+
+# In-memory cache of extracted navigation, least recently used evicted first
+NAVIGATION_CACHE_SIZE = 256
+_navigation_cache: "OrderedDict[Tuple[str, bool], Tuple[DocumentationLink, ...]]" = OrderedDict()
+
+# Browser pool sizing
+BROWSER_POOL_SIZE = 4
+BROWSER_POOL_RECYCLE_AFTER = 100
+MAX_PARALLEL_PAGES = 3
+
+# Server-side Chromium flags: skip GPU, extensions, background services and images
+CHROMIUM_LAUNCH_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-features=Translate,BackForwardCache",
+    "--blink-settings=imagesEnabled=false",
+]
+
+
+class _BrowserPool:
+    """
+    Chromium instances shared by rendering calls on one event loop.
+    
+    Browsers are launched on demand up to `size` and handed out one caller at a
+    time; every render gets its own BrowserContext. A browser is closed and
+    replaced after serving `recycle_after` contexts to bound its memory use.
+    """
+    
+    def __init__(self, size: int, recycle_after: int):
+        self.loop = asyncio.get_running_loop()
+        self._size = size
+        self._recycle_after = recycle_after
+        self._playwright = None
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._uses: Dict[Browser, int] = {}
+        self._start_lock = asyncio.Lock()
+    
+    async def acquire(self) -> Browser:
+        """Check out a browser, launching one if the pool is not yet full."""
+        while True:
+            if self._idle.empty() and len(self._uses) < self._size:
+                browser = await self._launch()
+                if browser is not None:
+                    return browser
+            browser = await self._idle.get()
+            # None marks a slot freed by a failed relaunch; try launching into it
+            if browser is not None:
+                return browser
+    
+    async def release(self, browser: Browser) -> None:
+        """
+        Return a browser to the pool, recycling it once it has served enough contexts.
+        
+        Never raises: callers release from a finally block, so a failed close or
+        relaunch must not turn a successful render into an error.
+        """
+        if browser not in self._uses:
+            # The pool was closed while the browser was checked out
+            return
+        
+        self._uses[browser] += 1
+        if self._uses[browser] >= self._recycle_after or not browser.is_connected():
+            del self._uses[browser]
+            try:
+                await browser.close()
+            except Exception as e:
+                print(f"⚠️  Warning: Could not close recycled browser: {e}")
+            try:
+                replacement = await self._launch()
+            except Exception as e:
+                print(f"⚠️  Warning: Could not launch replacement browser: {e}")
+                # Wake a waiting caller so it can launch into the freed slot itself
+                self._idle.put_nowait(None)
+                return
+            if replacement is None:
+                return
+            browser = replacement
+        self._idle.put_nowait(browser)
+    
+    async def close(self) -> None:
+        """Close every browser and stop Playwright."""
+        browsers = list(self._uses)
+        self._uses.clear()
+        for browser in browsers:
+            await browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+    
+    async def _launch(self) -> Optional[Browser]:
+        """Launch a new browser unless the pool is already full."""
+        async with self._start_lock:
+            if len(self._uses) >= self._size:
+                return None
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            browser = await self._playwright.chromium.launch(headless=True, args=CHROMIUM_LAUNCH_ARGS)
+            self._uses[browser] = 0
+            return browser
+
+
+_pool: Optional[_BrowserPool] = None
+
 
+def _get_pool() -> _BrowserPool:
+    """Return the browser pool for the running event loop, creating it if needed."""
+    global _pool
+    # Playwright objects are bound to the loop that created them
+    if _pool is None or _pool.loop is not asyncio.get_running_loop():
+        _pool = _BrowserPool(BROWSER_POOL_SIZE, BROWSER_POOL_RECYCLE_AFTER)
+    return _pool
 
-async def fetch_rendered_html(url: str, wait_for_selector: Optional[str] = None) -> str:
+
+async def close_pool() -> None:
+    """Shut down the shared browser pool, if one was started on this event loop."""
+    global _pool
+    if _pool is not None and _pool.loop is asyncio.get_running_loop():
+        await _pool.close()
+    _pool = None
+
+
+async def fetch_rendered_html(
+    url: str,
+    wait_for_selector: Optional[str] = None,
+    browser: Optional[Browser] = None
+) -> str:
     """
     Fetch HTML content using headless browser to handle JavaScript-rendered content.
     
     Args:
         url: URL to fetch
         wait_for_selector: Optional CSS selector to wait for before extracting HTML
+        browser: Optional already-launched browser to render in; when omitted a
+            browser is checked out of the shared pool (see close_pool)
         
     Returns:
         Rendered HTML content
     """
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+    if browser is not None:
+        return await _render_page(browser, url, wait_for_selector)
+    
+    pool = _get_pool()
+    browser = await pool.acquire()
+    try:
+        return await _render_page(browser, url, wait_for_selector)
+    finally:
+        await pool.release(browser)
+
+
+async def _render_page(browser: Browser, url: str, wait_for_selector: Optional[str]) -> str:
+    """Render a URL in a fresh context of the given browser and return its HTML."""
+    # A new context per render keeps cookies and storage from leaking between pages
+    context = await browser.new_context()
+    
+    try:
+        page = await _new_page(context)
+        return await _load_page(page, url, wait_for_selector)
+    finally:
+        await context.close()
+
+
+async def fetch_rendered_html_batch(
+    urls: List[str],
+    wait_for_selector: Optional[str] = None,
+    max_parallel: int = MAX_PARALLEL_PAGES
+) -> List[str]:
+    """
+    Fetch rendered HTML for several URLs, reusing one page per origin.
+    
+    URLs on the same origin are loaded one after another in a single context
+    and page, so they share connections, cookies and the script cache. Origins
+    are rendered concurrently, at most `max_parallel` at a time, on browsers
+    from the shared pool.
+    
+    Args:
+        urls: URLs to fetch
+        wait_for_selector: Optional CSS selector to wait for on every page
+        max_parallel: Maximum number of origins rendered at once
         
+    Returns:
+        Rendered HTML for each URL in input order; an empty string for URLs
+        that failed to load
+    """
+    origins: Dict[str, List[int]] = {}
+    for index, url in enumerate(urls):
+        parts = urlsplit(url)
+        origins.setdefault(f"{parts.scheme}://{parts.netloc}", []).append(index)
+    
+    results = [''] * len(urls)
+    semaphore = asyncio.Semaphore(max_parallel)
+    pool = _get_pool()
+    
+    async def render_origin(origin: str, indexes: List[int]) -> None:
+        async with semaphore:
+            # A browser or context failure only empties this origin's slots
+            try:
+                browser = await pool.acquire()
+                try:
+                    context = await browser.new_context()
+                    try:
+                        page = await _new_page(context)
+                        for index in indexes:
+                            try:
+                                results[index] = await _load_page(page, urls[index], wait_for_selector)
+                            except Exception as e:
+                                print(f"⚠️  Warning: Could not render {urls[index]}: {e}")
+                    finally:
+                        await context.close()
+                finally:
+                    await pool.release(browser)
+            except Exception as e:
+                print(f"⚠️  Warning: Could not render pages on {origin}: {e}")
+    
+    await asyncio.gather(*(render_origin(origin, indexes) for origin, indexes in origins.items()))
+    return results
+
+
+async def _new_page(context):
+    """Open a page that skips requests the navigation DOM does not need."""
+    page = await context.new_page()
+    # Sidebar extraction only needs the DOM and its scripts, so skip heavy assets
+    await page.route("**/*", _block_nonessential_requests)
+    return page
+
+
+async def _load_page(page, url: str, wait_for_selector: Optional[str]) -> str:
+    """Navigate a page to a URL, wait for its navigation and return the HTML."""
+    # Navigate to the page and wait for the navigation markup rather than network idle
+    await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+    
+    # Wait for specific selector if provided
+    if wait_for_selector:
+        await page.wait_for_selector(wait_for_selector, timeout=10000)
+    else:
+        # Default: wait until a known sidebar has rendered links
         try:
-            # Navigate to the page
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            
-            # Wait for specific selector if provided
-            if wait_for_selector:
-                await page.wait_for_selector(wait_for_selector, timeout=10000)
-            else:
-                # Default: wait a bit for dynamic content to load
-                await page.wait_for_timeout(2000)
-            
-            # Get the rendered HTML
-            html_content = await page.content()
-            
-            return html_content
-            
-        finally:
-            await browser.close()
+            await page.wait_for_selector(SIDEBAR_SIGNAL_SELECTOR, timeout=5000)
+        except PlaywrightTimeoutError:
+            # Unknown layout; give scripts a moment and parse whatever has rendered
+            await page.wait_for_timeout(500)
+    
+    # Get the rendered HTML
+    return await page.content()
 
 
-async def extract_navigation_smart(url: str) -> List[DocumentationLink]:
+async def _block_nonessential_requests(route) -> None:
+    """Abort requests for assets and trackers; let documents, scripts and XHR through."""
+    request = route.request
+    if (
+        request.resource_type in _BLOCKED_RESOURCE_TYPES
+        or _TRACKER_HOST_RE.search(urlsplit(request.url).hostname or '')
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def extract_navigation_smart(
+    url: str,
+    force_refresh: bool = False,
+    force_render: bool = False
+) -> List[DocumentationLink]:
     """
     Extract documentation links using headless browser and smart DOM parsing.
     
     This approach:
-    1. Uses headless browser to render JavaScript
-    2. Parses the DOM structure directly without AI
-    3. Handles hierarchical navigation with categories
+    1. Tries the server-rendered HTML first and skips the browser when it
+       already contains a sidebar
+    2. Otherwise uses headless browser to render JavaScript
+    3. Parses the DOM structure directly without AI
+    4. Handles hierarchical navigation with categories
+    
+    Rendered HTML is cached on disk (see HTML_CACHE_DIR), keyed by URL and the
+    page's ETag/Last-Modified header, so unchanged pages are not re-rendered.
+    Non-empty results are also kept in memory for the life of the process, up
+    to NAVIGATION_CACHE_SIZE URLs; see clear_navigation_cache().
     
     Args:
         url: URL of the documentation root page
+        force_refresh: Extract again even if cached results or HTML exist
+        force_render: Always render in the browser, skipping the static HTML check
         
     Returns:
         List of DocumentationLink objects with URLs and metadata
     """
-    # Fetch rendered HTML
-    html_content = await fetch_rendered_html(url)
-    
-    # Parse HTML
-    soup = BeautifulSoup(html_content, 'lxml')
-    
-    # Find sidebar/navigation
-    sidebar = _find_sidebar(soup)
-    
-    if not sidebar:
-        print("⚠️  Warning: Could not find sidebar navigation")
-        return []
-    
-    # Extract links from sidebar
-    links = _extract_links_from_sidebar(sidebar, url)
-    
+    cache_key = (url, force_render)
+    if not force_refresh and cache_key in _navigation_cache:
+        _navigation_cache.move_to_end(cache_key)
+        return [replace(link) for link in _navigation_cache[cache_key]]
+    
+    links = await _extract_navigation_uncached(url, force_refresh, force_render)
+    if links:
+        _navigation_cache[cache_key] = tuple(replace(link) for link in links)
+        if len(_navigation_cache) > NAVIGATION_CACHE_SIZE:
+            _navigation_cache.popitem(last=False)
     return links
 
 
-def _find_sidebar(soup: BeautifulSoup):
-    """Find the main sidebar/navigation element."""
-    
-    # Try common sidebar patterns with priority order
-    patterns = [
-        # Material for MkDocs pattern (div with md-sidebar class)
-        {'name': ['div'], 'class_': lambda x: x and 'md-sidebar' in str(x) and 'primary' in str(x)},
-        # Docusaurus pattern (aside with sidebar class)
-        {'name': ['aside'], 'class_': lambda x: x and 'sidebar' in str(x).lower() and 'banner' not in str(x).lower()},
-        # Generic sidebar patterns (div/nav/aside with sidebar-related classes)
-        {'name': ['div', 'nav', 'aside'], 'class_': lambda x: x and any(
-            term in str(x).lower() for term in ['sidebar', 'side-nav', 'sidenav', 'docs-nav', 'doc-nav']
-        ) and 'banner' not in str(x).lower()},
-        # ID-based patterns
-        {'name': ['aside', 'nav', 'div'], 'id': lambda x: x and any(
-            term in str(x).lower() for term in ['sidebar', 'navigation', 'nav', 'menu']
-        )},
-    ]
-    
-    for pattern in patterns:
-        sidebar = soup.find(**pattern)
-        if sidebar:
-            # Verify it has a reasonable number of links (at least 5)
-            links = sidebar.find_all('a', href=True)
-            if len(links) >= 5:
-                return sidebar
-    
-    # Fallback: find any nav or aside (but not banners)
-    for elem in soup.find_all(['nav', 'aside']):
-        classes = ' '.join(elem.get('class', [])).lower()
-        if 'banner' not in classes:
-            links = elem.find_all('a', href=True)
-            if len(links) >= 5:
-                return elem
-    
-    return None
-
-
-def _extract_links_from_sidebar(sidebar, base_url: str) -> List[DocumentationLink]:
-    """
-    Extract links from sidebar with category information.
-    
-    Handles hierarchical structures like:
-    - Docusaurus (nested ul/li with category classes)
-    - Material for MkDocs (md-nav structure)
-    - Generic nested lists
-    - Flat link lists
-    """
-    links = []
-    base_domain = urlparse(base_url).netloc
-    
-    # Check if this is a Docusaurus-style sidebar
-    if _is_docusaurus_sidebar(sidebar):
-        links = _extract_docusaurus_links(sidebar, base_url, base_domain)
-    # Check if this is a Material for MkDocs sidebar
-    elif _is_material_mkdocs_sidebar(sidebar):
-        links = _extract_material_mkdocs_links(sidebar, base_url, base_domain)
-    else:
-        # Generic extraction
-        links = _extract_generic_links(sidebar, base_url, base_domain)
-    
-    # Remove duplicates while preserving order
-    seen_urls = set()
-    unique_links = []
-    for link in links:
-        if link.url not in seen_urls:
-            seen_urls.add(link.url)
-            unique_links.append(link)
-    
-    return unique_links
+def clear_navigation_cache() -> None:
+    """Forget navigation results memoized by extract_navigation_smart."""
+    _navigation_cache.clear()
 
 
-def _is_docusaurus_sidebar(sidebar) -> bool:
-    """Check if this is a Docusaurus-style sidebar."""
-    # Docusaurus uses specific class names
-    return bool(sidebar.find(class_=lambda x: x and 'theme-doc-sidebar' in str(x)))
+async def _extract_navigation_uncached(
+    url: str,
+    force_refresh: bool,
+    force_render: bool
+) -> List[DocumentationLink]:
+    """Run static/rendered extraction for extract_navigation_smart."""
+    validator = None
+    if not force_render:
+        response = await _fetch_static_page(url)
+        if response is not None:
+            sidebar = _find_sidebar_in_html(response.text)
+            if sidebar:
+                links = _extract_links_from_sidebar(sidebar, url)
+                if links:
+                    return links
+            validator = _cache_validator(response.headers)
+    
+    if validator is None:
+        validator = await _fetch_cache_validator(url)
+    cache_path = _html_cache_path(url, validator)
+    
+    html_content = None if force_refresh else _read_cached_html(cache_path)
+    if html_content is None:
+        # Fetch rendered HTML
+        html_content = await fetch_rendered_html(url)
+        _write_cached_html(cache_path, html_content)
+    
+    return _parse_navigation(html_content, url)
 
 
-def _is_material_mkdocs_sidebar(sidebar) -> bool:
-    """Check if this is a Material for MkDocs sidebar."""
-    # Material for MkDocs uses md-sidebar and md-nav classes
-    classes = ' '.join(sidebar.get('class', []))
-    return 'md-sidebar' in classes or bool(sidebar.find(class_=lambda x: x and 'md-nav' in str(x)))
+async def _fetch_static_page(url: str) -> Optional[httpx.Response]:
+    """Fetch a page without rendering it, or None if the request fails."""
+    try:
+        async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
+            response = await client.get(url)
+    except httpx.HTTPError:
+        return None
+    if response.status_code >= 400:
+        return None
+    return response
 
 
-def _extract_material_mkdocs_links(sidebar, base_url: str, base_domain: str) -> List[DocumentationLink]:
-    """Extract links from Material for MkDocs sidebar."""
-    links = []
-    
-    # Find the main navigation
-    nav = sidebar.find('nav', class_='md-nav')
-    if not nav:
-        return links
-    
-    # Find all top-level list items
-    ul = nav.find('ul', class_='md-nav__list')
-    if not ul:
-        return links
-    
-    def extract_from_nav_item(item, parent_category=None):
-        """Recursively extract links from a nav item."""
-        item_links = []
-        
-        # Check if this is a nested item (has children)
-        is_nested = 'md-nav__item--nested' in ' '.join(item.get('class', []))
-        
-        if is_nested:
-            # Get the category name from the link or label
-            category_link = item.find('a', class_='md-nav__link', recursive=False)
-            if not category_link:
-                # Try to find it in the container
-                container = item.find('div', class_='md-nav__link')
-                if container:
-                    category_link = container.find('a', class_='md-nav__link')
-            
-            category_name = None
-            if category_link:
-                category_name = category_link.get_text(strip=True)
-                # Add the category link itself
-                doc_link = _create_doc_link(category_link, base_url, base_domain, parent_category)
-                if doc_link:
-                    item_links.append(doc_link)
-            
-            # Find nested navigation
-            nested_nav = item.find('nav', class_='md-nav')
-            if nested_nav:
-                # Find the nested ul inside the nav
-                nested_ul = nested_nav.find('ul', class_='md-nav__list')
-                if nested_ul:
-                    nested_items = nested_ul.find_all('li', class_='md-nav__item', recursive=False)
-                    for nested_item in nested_items:
-                        item_links.extend(extract_from_nav_item(nested_item, category_name or parent_category))
-        else:
-            # This is a regular link item
-            link = item.find('a', class_='md-nav__link', recursive=False)
-            if link:
-                doc_link = _create_doc_link(link, base_url, base_domain, parent_category)
-                if doc_link:
-                    item_links.append(doc_link)
-        
-        return item_links
-    
-    # Process all top-level items
-    top_level_items = ul.find_all('li', class_='md-nav__item', recursive=False)
-    for item in top_level_items:
-        links.extend(extract_from_nav_item(item))
-    
-    return links
+async def _fetch_cache_validator(url: str) -> Optional[str]:
+    """Get the ETag or Last-Modified header of a page, or None if unavailable."""
+    try:
+        async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
+            response = await client.head(url)
+    except httpx.HTTPError:
+        return None
+    if response.status_code >= 400:
+        return None
+    return _cache_validator(response.headers)
 
 
-def _extract_docusaurus_links(sidebar, base_url: str, base_domain: str) -> List[DocumentationLink]:
-    """Extract links from Docusaurus-style sidebar."""
-    links = []
-    
-    # Find all list items
-    list_items = sidebar.find_all('li', class_=lambda x: x and 'theme-doc-sidebar-item' in str(x))
-    
-    current_category = None
-    
-    for item in list_items:
-        # Check if this is a category item
-        if 'theme-doc-sidebar-item-category' in ' '.join(item.get('class', [])):
-            # This is a category - get the category name
-            category_link = item.find('a', class_=lambda x: x and 'menu__link--sublist' in str(x))
-            if category_link:
-                current_category = category_link.get_text(strip=True)
-            
-            # Extract nested links under this category
-            nested_ul = item.find('ul', class_='menu__list')
-            if nested_ul:
-                nested_items = nested_ul.find_all('li', recursive=False)
-                for nested_item in nested_items:
-                    link = nested_item.find('a', href=True)
-                    if link:
-                        doc_link = _create_doc_link(link, base_url, base_domain, current_category)
-                        if doc_link:
-                            links.append(doc_link)
-        
-        # Check if this is a regular link item (not a category)
-        elif 'theme-doc-sidebar-item-link' in ' '.join(item.get('class', [])):
-            link = item.find('a', href=True, recursive=False)
-            if link:
-                doc_link = _create_doc_link(link, base_url, base_domain, None)
-                if doc_link:
-                    links.append(doc_link)
+def _cache_validator(headers) -> Optional[str]:
+    """Pick the ETag, or failing that the Last-Modified header, from a response."""
+    return headers.get('etag') or headers.get('last-modified')
+
+
+def _html_cache_path(url: str, validator: Optional[str]) -> Path:
+    """Cache file for a URL at a given validator."""
+    key = hashlib.sha256(f"{url}\n{validator or ''}".encode('utf-8')).hexdigest()
+    return HTML_CACHE_DIR / f"{key}.html"
+
+
+def _read_cached_html(path: Path) -> Optional[str]:
+    """Read cached HTML if it exists and has not expired, removing it once expired."""
+    try:
+        if time.time() - path.stat().st_mtime > HTML_CACHE_TTL:
+            path.unlink(missing_ok=True)
+            return None
+        return path.read_text(encoding='utf-8')
+    except OSError:
+        return None
+
+
+def _write_cached_html(path: Path, html_content: str) -> None:
+    """Store rendered HTML; caching is best effort and never fails extraction."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see partial HTML
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(html_content, encoding='utf-8')
+        os.replace(tmp_path, path)
+        _prune_html_cache(path.parent)
+    except OSError as e:
+        print(f"⚠️  Warning: Could not cache rendered HTML: {e}")
+
+
+def _prune_html_cache(cache_dir: Path) -> None:
+    """
+    Delete expired cache files, then the oldest ones while over HTML_CACHE_MAX_BYTES.
     
-    return links
+    Files left behind by old validators are never read again, so without this
+    the cache directory would only grow.
+    
+    Args:
+        cache_dir: Directory holding the cached HTML files
+    """
+    now = time.time()
+    entries = []
+    for entry in os.scandir(cache_dir):
+        try:
+            stat = entry.stat()
+            # Expired pages and temporary files orphaned by interrupted writes
+            if now - stat.st_mtime > HTML_CACHE_TTL:
+                os.unlink(entry.path)
+            elif entry.name.endswith('.html'):
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            # Another process may have removed or replaced the file meanwhile
+            continue
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, file_path in sorted(entries):
+        if total <= HTML_CACHE_MAX_BYTES:
+            break
+        try:
+            os.unlink(file_path)
+        except OSError:
+            continue
+        total -= size
 
 
-def _extract_generic_links(sidebar, base_url: str, base_domain: str) -> List[DocumentationLink]:
-    """Extract links from generic sidebar structure."""
-    links = []
+async def extract_navigation_batch(
+    urls: List[str],
+    max_parallel: int = MAX_PARALLEL_PAGES
+) -> Dict[str, List[DocumentationLink]]:
+    """
+    Extract navigation from several documentation roots concurrently.
     
-    # Find all links in the sidebar
-    all_links = sidebar.find_all('a', href=True)
+    Pages are rendered through the shared browser pool, each in its own
+    context, with at most `max_parallel` pages open at a time. A URL that
+    fails to render maps to an empty list instead of failing the batch.
     
-    for link in all_links:
-        # Try to determine category from parent structure
-        category = None
-        
-        # Look for parent heading
-        parent = link.find_parent(['li', 'div', 'section'])
-        if parent:
-            # Look for a heading in the parent or previous siblings
-            heading = parent.find_previous(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-            if heading:
-                heading_text = heading.get_text(strip=True)
-                # Only use as category if it's reasonably short
-                if len(heading_text) < 50:
-                    category = heading_text
+    Args:
+        urls: URLs of documentation root pages
+        max_parallel: Maximum number of pages rendered at once
         
-        doc_link = _create_doc_link(link, base_url, base_domain, category)
-        if doc_link:
-            links.append(doc_link)
+    Returns:
+        Mapping of each URL to its extracted documentation links
+    """
+    semaphore = asyncio.Semaphore(max_parallel)
     
-    return links
+    async def extract_one(url: str) -> List[DocumentationLink]:
+        async with semaphore:
+            return await extract_navigation_smart(url)
+    
+    results = await asyncio.gather(*(extract_one(url) for url in urls), return_exceptions=True)
+    
+    navigation = {}
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            print(f"⚠️  Warning: Navigation extraction failed for {url}: {result}")
+            result = []
+        navigation[url] = result
+    return navigation
 
 
-def _create_doc_link(link_tag, base_url: str, base_domain: str, category: Optional[str]) -> Optional[DocumentationLink]:
-    """Create a DocumentationLink from an anchor tag."""
-    href = link_tag.get('href', '')
-    title = link_tag.get_text(strip=True) or link_tag.get('title', '')
-    
-    # Skip empty or anchor-only links
-    if not href or not title or href.startswith('#'):
-        return None
+def _parse_navigation(html_content: str, url: str) -> List[DocumentationLink]:
+    """Find the sidebar in rendered HTML and extract its links."""
+    # Find sidebar/navigation
+    sidebar = _find_sidebar_in_html(html_content)
     
-    # Resolve relative URLs
-    absolute_url = urljoin(base_url, href)
+    if not sidebar:
+        print(f"⚠️  Warning: Could not find sidebar navigation on {url}")
+        return []
     
-    # Filter out external links
-    link_domain = urlparse(absolute_url).netloc
-    if link_domain and link_domain != base_domain:
-        return None
+    # Extract links from sidebar
+    return _extract_links_from_sidebar(sidebar, url)
+
+
+def _find_sidebar_in_html(html_content: str):
+    """Parse HTML and return its sidebar element, or None."""
+    # Parse only the sidebar candidates; the rest of the page is never built
+    sidebar = _find_sidebar(BeautifulSoup(html_content, 'lxml', parse_only=NAV_STRAINER))
     
-    # Filter out non-documentation patterns
-    url_lower = absolute_url.lower()
-    if any(pattern in url_lower for pattern in [
-        'twitter.com', 'facebook.com', 'linkedin.com', 'github.com',
-        'discord.com', 'slack.com', 'youtube.com',
-        '/login', '/signup', '/register', '/auth',
-        '/search', '?search=', '/download',
-        'mailto:', 'tel:', 'javascript:'
-    ]):
-        return None
+    if not sidebar:
+        # Fall back to the whole document in case the strainer dropped the sidebar
+        sidebar = _find_sidebar(BeautifulSoup(html_content, 'lxml'))
     
-    return DocumentationLink(
-        url=absolute_url,
-        title=title,
-        category=category
-    )
+    return sidebar
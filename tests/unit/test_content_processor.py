@@ -2,10 +2,71 @@
 
 import pytest
 from unittest.mock import Mock, patch
-from jedi_mcp.content_processor import process_content, _fallback_grouping
+from jedi_mcp.content_processor import process_content, _fallback_grouping, _dumps_for_prompt, _loads_response
 from jedi_mcp.models import PageContent, ContentGroup
 
 
+# Canned agent replies for the process_content tests
+GROUPING_RESPONSE = '''[
+    {
+        "name": "getting-started",
+        "page_indices": [0],
+        "description": "Introduction and setup"
+    }
+]'''
+
+SUMMARY_RESPONSE = '''# Getting Started
+
+This is a comprehensive guide to getting started.
+
+## Installation
+
+Install the package using pip:
+
+```bash
+pip install example
+```
+
+## Quick Start
+
+Here's a simple example:
+
+```python
+import example
+example.run()
+```
+'''
+
+
+@pytest.fixture(scope="module")
+def pages_factory():
+    """Build lists of pages with distinct URL sections, reused across tests by size."""
+    cache = {}
+    
+    def make(count):
+        if count not in cache:
+            cache[count] = [
+                PageContent(
+                    url=f"https://example.com/section{i}/page",
+                    title=f"Page {i}",
+                    content=f"Content {i}",
+                    code_blocks=[]
+                )
+                for i in range(count)
+            ]
+        return cache[count]
+    
+    return make
+
+
+@pytest.fixture
+def mock_agent(monkeypatch):
+    """Replace the Strands Agent with a mock; tests set its responses."""
+    agent = Mock()
+    monkeypatch.setattr("jedi_mcp.content_processor.Agent", lambda *args, **kwargs: agent)
+    return agent
+
+
 class TestProcessContent:
     """Tests for the process_content function."""
     
@@ -14,43 +75,17 @@ class TestProcessContent:
         result = process_content([])
         assert result == []
     
-    def test_fallback_grouping_single_page(self):
+    def test_fallback_grouping_single_page(self, pages_factory):
         """Test fallback grouping with a single page."""
-        pages = [
-            PageContent(
-                url="https://example.com/docs/intro",
-                title="Introduction",
-                content="Welcome to the documentation",
-                code_blocks=[]
-            )
-        ]
+        pages = pages_factory(1)
         
         groups = _fallback_grouping(pages)
         assert len(groups) > 0
         assert all('name' in g and 'page_indices' in g for g in groups)
     
-    def test_fallback_grouping_multiple_pages(self):
+    def test_fallback_grouping_multiple_pages(self, pages_factory):
         """Test fallback grouping with multiple pages."""
-        pages = [
-            PageContent(
-                url="https://example.com/docs/intro",
-                title="Introduction",
-                content="Welcome",
-                code_blocks=[]
-            ),
-            PageContent(
-                url="https://example.com/docs/guide",
-                title="Guide",
-                content="How to use",
-                code_blocks=[]
-            ),
-            PageContent(
-                url="https://example.com/api/reference",
-                title="API Reference",
-                content="API docs",
-                code_blocks=[]
-            )
-        ]
+        pages = pages_factory(3)
         
         groups = _fallback_grouping(pages)
         assert len(groups) > 0
@@ -61,66 +96,30 @@ class TestProcessContent:
             all_indices.extend(group['page_indices'])
         assert set(all_indices) == set(range(len(pages)))
     
-    def test_fallback_grouping_consolidates_many_groups(self):
+    def test_fallback_grouping_consolidates_many_groups(self, pages_factory):
         """Test that fallback grouping consolidates when there are too many groups."""
         # Create 15 pages with different URL paths
-        pages = [
-            PageContent(
-                url=f"https://example.com/section{i}/page",
-                title=f"Page {i}",
-                content=f"Content {i}",
-                code_blocks=[]
-            )
-            for i in range(15)
-        ]
+        pages = pages_factory(15)
         
         groups = _fallback_grouping(pages)
         # Should consolidate to avoid too many groups
         assert len(groups) <= 10
     
-    @patch('jedi_mcp.content_processor.Agent')
-    def test_process_content_with_mocked_agent(self, mock_agent_class):
+    def test_process_content_with_mocked_agent(self, mock_agent):
         """Test process_content with mocked AI agent."""
-        # Create mock agent instance
-        mock_agent = Mock()
-        mock_agent_class.return_value = mock_agent
+        # Answer by prompt kind, so extra agent calls cannot exhaust a response list
+        history_at_summary = []
         
-        # Mock grouping response
-        grouping_response = Mock()
-        grouping_response.__str__ = Mock(return_value='''[
-            {
-                "name": "getting-started",
-                "page_indices": [0],
-                "description": "Introduction and setup"
-            }
-        ]''')
+        def respond(prompt, *args, **kwargs):
+            mock_agent.messages.append(prompt)
+            if "JSON array of groups" in prompt:
+                return GROUPING_RESPONSE
+            history_at_summary.append(len(mock_agent.messages))
+            return SUMMARY_RESPONSE
         
-        # Mock summary response
-        summary_response = Mock()
-        summary_response.__str__ = Mock(return_value='''# Getting Started
-
-This is a comprehensive guide to getting started.
-
-## Installation
-
-Install the package using pip:
-
-```bash
-pip install example
-```
-
-## Quick Start
-
-Here's a simple example:
-
-```python
-import example
-example.run()
-```
-''')
+        mock_agent.messages = []
         
-        # Set up mock to return different responses for different calls
-        mock_agent.side_effect = [grouping_response, summary_response]
+        mock_agent.side_effect = respond
         
         # Create test pages
         pages = [
@@ -141,30 +140,58 @@ example.run()
         assert result[0].name == "getting-started"
         assert "Getting Started" in result[0].summary_markdown
         assert len(result[0].pages) == 1
+        # The summary prompt is sent without the grouping conversation
+        assert history_at_summary == [1]
     
-    def test_process_content_handles_invalid_json_response(self):
+    def test_process_content_handles_invalid_json_response(self, mock_agent):
         """Test that process_content handles invalid JSON gracefully."""
-        with patch('jedi_mcp.content_processor.Agent') as mock_agent_class:
-            mock_agent = Mock()
-            mock_agent_class.return_value = mock_agent
-            
-            # Mock invalid JSON response
-            invalid_response = Mock()
-            invalid_response.__str__ = Mock(return_value="This is not valid JSON")
-            mock_agent.return_value = invalid_response
-            
-            pages = [
-                PageContent(
-                    url="https://example.com/docs/intro",
-                    title="Introduction",
-                    content="Welcome",
-                    code_blocks=[]
-                )
-            ]
-            
-            # Should fall back to automatic grouping
-            result = process_content(pages)
-            
-            # Should still return groups (using fallback)
-            assert len(result) > 0
-            assert all(isinstance(g, ContentGroup) for g in result)
+        # Invalid JSON response; agent replies are only ever read through str()
+        mock_agent.return_value = "This is not valid JSON"
+        
+        pages = [
+            PageContent(
+                url="https://example.com/docs/intro",
+                title="Introduction",
+                content="Welcome",
+                code_blocks=[]
+            )
+        ]
+        
+        # Should fall back to automatic grouping
+        result = process_content(pages)
+        
+        # Should still return groups (using fallback)
+        assert len(result) > 0
+        assert all(isinstance(g, ContentGroup) for g in result)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_for_prompt_matches_stdlib_layout(use_orjson):
+    """Test that prompt JSON is the same with and without orjson."""
+    import json
+    import jedi_mcp.content_processor as content_processor
+
+    data = [{"url": "https://example.com/café", "title": 'Say "hi"', "code_samples": [], "count": 2}]
+    orjson = content_processor.orjson if use_orjson else None
+    if use_orjson and orjson is None:
+        pytest.skip("orjson not installed")
+
+    with patch.object(content_processor, "orjson", orjson):
+        assert _dumps_for_prompt(data) == json.dumps(data, indent=2, ensure_ascii=False)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_loads_response_with_and_without_orjson(use_orjson):
+    """Test that grouping responses parse the same with and without orjson."""
+    import jedi_mcp.content_processor as content_processor
+
+    orjson = content_processor.orjson if use_orjson else None
+    if use_orjson and orjson is None:
+        pytest.skip("orjson not installed")
+
+    with patch.object(content_processor, "orjson", orjson):
+        assert _loads_response(GROUPING_RESPONSE) == [
+            {"name": "getting-started", "page_indices": [0], "description": "Introduction and setup"}
+        ]
+        with pytest.raises(ValueError):
+            _loads_response('[{"name": }]')
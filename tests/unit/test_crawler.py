@@ -113,6 +113,32 @@ class TestExtractContentFromHtml:
         assert result.content == ""
         assert result.code_blocks == []
     
+    def test_skips_scripts_comments_and_nested_chrome(self):
+        """Test that non-text nodes and chrome nested in content are left out."""
+        html = """
+        <html>
+            <head><title>Page</title><style>p { color: red; }</style></head>
+            <body>
+                <main>
+                    Intro<nav>Skip me</nav>after nav
+                    <script>var hidden = 1;</script><!-- a comment -->
+                    <pre><code>x = 1<aside>not code</aside></code></pre>
+                </main>
+            </body>
+        </html>
+        """
+        result = extract_content_from_html(html, "https://example.com")
+        
+        assert result.title == "Page"
+        assert result.content == "Intro\nafter nav\nx = 1"
+        assert result.code_blocks == ["x = 1", "x = 1"]
+    
+    def test_handles_blank_html(self):
+        """Test that input with no elements yields an empty page."""
+        result = extract_content_from_html("  ", "https://example.com")
+        
+        assert (result.title, result.content, result.code_blocks) == ("", "", [])
+    
     def test_preserves_semantic_structure(self):
         """Test that semantic structure is preserved with newlines."""
         html = """
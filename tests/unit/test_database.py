@@ -1,6 +1,7 @@
 """Unit tests for database operations."""
 
 import pytest
+import sqlite3
 import tempfile
 from pathlib import Path
 
@@ -19,7 +20,9 @@ def temp_db():
 @pytest.fixture
 def db_manager(temp_db):
     """Create a DatabaseManager instance with temporary database."""
-    return DatabaseManager(db_path=temp_db)
+    manager = DatabaseManager(db_path=temp_db)
+    yield manager
+    manager.close()
 
 
 def test_initialize_schema(db_manager):
@@ -183,3 +186,203 @@ def test_parameterized_queries_prevent_sql_injection(db_manager):
     retrieved = db_manager.get_content_group_by_name("test-project", malicious_name)
     assert retrieved is not None
     assert retrieved.name == malicious_name
+
+
+def test_store_content_groups_in_one_transaction(db_manager):
+    """Test that bulk storage is all-or-nothing and keeps input order."""
+    db_manager.initialize_schema("test-project")
+    groups = [
+        ContentGroup(
+            name=f"Group {i}",
+            summary_markdown=f"# Group {i}",
+            pages=[PageContent(url=f"https://example.com/{i}", title=f"Page {i}", content="Text", code_blocks=[])]
+        )
+        for i in range(3)
+    ]
+
+    ids = db_manager.store_content_groups("test-project", groups, "https://example.com")
+
+    assert len(ids) == 3 and ids == sorted(ids)
+    assert [g.name for g in db_manager.get_all_content_groups("test-project")] == ["Group 0", "Group 1", "Group 2"]
+
+    # A duplicate name violates UNIQUE(project_id, name) and rolls back the whole batch
+    with pytest.raises(sqlite3.IntegrityError):
+        db_manager.store_content_groups("test-project", [
+            ContentGroup(name="Group 3", summary_markdown="# Group 3", pages=[]),
+            ContentGroup(name="Group 0", summary_markdown="# Again", pages=[]),
+        ])
+    assert len(db_manager.get_all_content_groups("test-project")) == 3
+
+
+def test_bulk_ingest_rebuilds_indexes(db_manager):
+    """Test that bulk ingest drops indexes while loading and restores them after."""
+    db_manager.initialize_schema("test-project")
+
+    def index_names():
+        with db_manager._get_connection() as conn:
+            rows = conn.execute("SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'idx_%'")
+            return {row[0] for row in rows}
+
+    expected = {"idx_pages_group"}
+    assert index_names() == expected
+
+    with db_manager.bulk_ingest():
+        assert index_names() == set()
+        db_manager.store_content_groups("test-project", [
+            ContentGroup(name="Bulk", summary_markdown="# Bulk", pages=[
+                PageContent(url="https://example.com/bulk", title="Bulk", content="Text", code_blocks=[])
+            ])
+        ])
+
+    assert index_names() == expected
+    assert len(db_manager.get_content_group_by_name("test-project", "Bulk").pages) == 1
+
+
+def test_bulk_ingest_is_single_threaded(db_manager):
+    """Test that other threads cannot use the manager while a bulk ingest runs."""
+    import threading
+
+    db_manager.initialize_schema("test-project")
+    errors = []
+
+    def store_in_thread():
+        try:
+            db_manager.store_content_group(
+                "test-project", ContentGroup(name="Other", summary_markdown="", pages=[])
+            )
+        except RuntimeError as e:
+            errors.append(e)
+
+    with db_manager.bulk_ingest():
+        with pytest.raises(RuntimeError):
+            with db_manager.bulk_ingest():
+                pass
+        thread = threading.Thread(target=store_in_thread)
+        thread.start()
+        thread.join()
+
+    assert len(errors) == 1
+    # The manager is usable from any thread again afterwards
+    thread = threading.Thread(target=store_in_thread)
+    thread.start()
+    thread.join()
+    assert len(errors) == 1
+    assert db_manager.get_content_group_by_name("test-project", "Other") is not None
+
+
+def test_connection_is_reused_per_thread(db_manager):
+    """Test that a thread keeps one WAL-mode connection across calls."""
+    import threading
+
+    with db_manager._get_connection() as first:
+        journal_mode = first.execute("PRAGMA journal_mode").fetchone()[0]
+    with db_manager._get_connection() as second:
+        assert second is first
+
+    other = []
+
+    def connect_in_thread():
+        with db_manager._get_connection() as conn:
+            other.append(conn)
+
+    thread = threading.Thread(target=connect_in_thread)
+    thread.start()
+    thread.join()
+
+    assert journal_mode == "wal"
+    assert other[0] is not first
+
+
+def test_iter_content_groups_streams_in_order(db_manager):
+    """Test that streamed groups keep storage order, their pages, and empty groups."""
+    db_manager.initialize_schema("test-project")
+    pages = [
+        PageContent(url=f"https://example.com/{i}", title=f"Page {i}", content="", code_blocks=[])
+        for i in range(3)
+    ]
+    db_manager.store_content_groups("test-project", [
+        ContentGroup(name="First", summary_markdown="", pages=pages[:2]),
+        ContentGroup(name="Empty", summary_markdown="", pages=[]),
+        ContentGroup(name="Last", summary_markdown="", pages=pages[2:]),
+    ])
+
+    groups = db_manager.iter_content_groups("test-project")
+
+    assert next(groups).name == "First"
+    assert [(g.name, [p.url for p in g.pages]) for g in groups] == [
+        ("Empty", []),
+        ("Last", ["https://example.com/2"]),
+    ]
+    assert list(db_manager.iter_content_groups("missing-project")) == []
+
+
+def test_close_closes_connections_from_all_threads(db_manager):
+    """Test that close() reaches every thread's connection and allows reuse."""
+    import threading
+
+    with db_manager._get_connection() as main_conn:
+        pass
+    opened = []
+
+    def connect_in_thread():
+        with db_manager._get_connection() as conn:
+            opened.append(conn)
+
+    thread = threading.Thread(target=connect_in_thread)
+    thread.start()
+    thread.join()
+
+    db_manager.close()
+
+    for conn in (main_conn, opened[0]):
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    with db_manager._get_connection() as conn:
+        assert conn is not main_conn
+
+
+def test_get_content_group_summaries(db_manager):
+    """Test that summaries list group names and summaries in storage order."""
+    db_manager.initialize_schema("test-project")
+    page = PageContent(url="https://example.com/a", title="A", content="Body", code_blocks=[])
+    db_manager.store_content_groups("test-project", [
+        ContentGroup(name="Intro", summary_markdown="# Intro", pages=[page]),
+        ContentGroup(name="API", summary_markdown="# API", pages=[]),
+    ])
+
+    assert db_manager.get_content_group_summaries("test-project") == [
+        {'name': "Intro", 'summary_markdown': "# Intro"},
+        {'name': "API", 'summary_markdown': "# API"},
+    ]
+    assert db_manager.get_content_group_summaries("missing-project") == []
+
+
+def test_initialize_schema_records_version(db_manager, temp_db):
+    """Test that the schema version is stored so later runs skip table creation."""
+    from jedi_mcp.database import SCHEMA_VERSION
+
+    db_manager.initialize_schema("test-project")
+    db_manager.initialize_schema("test-project")
+
+    with sqlite3.connect(temp_db) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+
+def test_initialize_schema_drops_redundant_project_index(db_manager, temp_db):
+    """Test that group lookups use the UNIQUE(project_id, name) index once the old index is gone."""
+    with sqlite3.connect(temp_db) as conn:
+        # A version 1 database with its separate project_id index
+        conn.execute("PRAGMA user_version=1")
+        conn.execute("CREATE TABLE content_groups (id INTEGER PRIMARY KEY AUTOINCREMENT, project_id INTEGER NOT NULL, "
+                     "name TEXT NOT NULL, summary_markdown TEXT NOT NULL, UNIQUE(project_id, name))")
+        conn.execute("CREATE INDEX idx_content_groups_project ON content_groups(project_id)")
+
+    db_manager.initialize_schema("test-project")
+
+    with sqlite3.connect(temp_db) as conn:
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+        assert "idx_content_groups_project" not in names
+        plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM content_groups WHERE project_id = ? AND name = ?", (1, "x")
+        ))
+        assert "sqlite_autoindex_content_groups_1" in plan
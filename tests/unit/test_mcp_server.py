@@ -1,8 +1,6 @@
 """Unit tests for MCP server implementation."""
 
 import pytest
-from pathlib import Path
-import tempfile
 import sqlite3
 
 from jedi_mcp.mcp_server import (
@@ -48,6 +46,12 @@ class TestToolNameSanitization:
         assert sanitize_tool_name("") == "documentation"
         assert sanitize_tool_name("   ") == "documentation"
         assert sanitize_tool_name("!!!") == "documentation"
+    
+    def test_sanitize_non_ascii_and_other_whitespace(self):
+        """Test sanitization drops non-ASCII characters and treats all whitespace as spaces."""
+        assert sanitize_tool_name("Café Guide") == "caf_guide"
+        assert sanitize_tool_name("Getting\tStarted\u00a0Now") == "getting_started_now"
+        assert sanitize_tool_name("日本語") == "documentation"
 
 
 class TestToolDescriptionGeneration:
@@ -95,95 +99,89 @@ class TestToolDescriptionGeneration:
         assert description == "Documentation content"
 
 
+@pytest.fixture(scope="module")
+def db_with_content(tmp_path_factory):
+    """Create a database with test content, shared by this module."""
+    temp_db = tmp_path_factory.mktemp("mcp-server") / "test.db"
+    db_manager = DatabaseManager(temp_db)
+    project_name = "test-project"
+
+    # Initialize schema
+    db_manager.initialize_schema(project_name)
+
+    # Add test content groups
+    groups = [
+        ContentGroup(
+            name="Getting Started",
+            summary_markdown="# Getting Started\n\nLearn how to get started with our API.",
+            pages=[
+                PageContent(
+                    url="https://example.com/getting-started",
+                    title="Getting Started",
+                    content="Getting started content",
+                    code_blocks=[]
+                )
+            ]
+        ),
+        ContentGroup(
+            name="API Reference",
+            summary_markdown="# API Reference\n\nComplete API documentation with examples.",
+            pages=[
+                PageContent(
+                    url="https://example.com/api",
+                    title="API Reference",
+                    content="API reference content",
+                    code_blocks=[]
+                )
+            ]
+        )
+    ]
+
+    for group in groups:
+        db_manager.store_content_group(project_name, group, "https://example.com")
+
+    yield temp_db, db_manager, project_name
+    db_manager.close()
+
+
+@pytest.fixture(scope="module")
+def server(db_with_content):
+    """Create the MCP server once for the tests that only inspect it."""
+    db_path, db_manager, project_name = db_with_content
+    return create_mcp_server(project_name, db_manager=db_manager), project_name
+
+
 class TestMCPServerCreation:
     """Tests for MCP server creation."""
     
     @pytest.fixture
-    def temp_db(self):
-        """Create a temporary database for testing."""
-        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-            db_path = Path(f.name)
-        
-        yield db_path
-        
-        # Cleanup
-        if db_path.exists():
-            db_path.unlink()
+    def temp_db(self, tmp_path):
+        """Create a temporary database path; pytest removes it with its WAL files."""
+        return tmp_path / "test.db"
     
-    @pytest.fixture
-    def db_with_content(self, temp_db):
-        """Create a database with test content."""
-        db_manager = DatabaseManager(temp_db)
-        project_name = "test-project"
-        
-        # Initialize schema
-        db_manager.initialize_schema(project_name)
-        
-        # Add test content groups
-        groups = [
-            ContentGroup(
-                name="Getting Started",
-                summary_markdown="# Getting Started\n\nLearn how to get started with our API.",
-                pages=[
-                    PageContent(
-                        url="https://example.com/getting-started",
-                        title="Getting Started",
-                        content="Getting started content",
-                        code_blocks=[]
-                    )
-                ]
-            ),
-            ContentGroup(
-                name="API Reference",
-                summary_markdown="# API Reference\n\nComplete API documentation with examples.",
-                pages=[
-                    PageContent(
-                        url="https://example.com/api",
-                        title="API Reference",
-                        content="API reference content",
-                        code_blocks=[]
-                    )
-                ]
-            )
-        ]
-        
-        for group in groups:
-            db_manager.store_content_group(project_name, group, "https://example.com")
-        
-        return temp_db, db_manager, project_name
-    
-    def test_create_server_with_valid_project(self, db_with_content):
+    def test_create_server_with_valid_project(self, server):
         """Test creating MCP server with valid project."""
-        db_path, db_manager, project_name = db_with_content
-        
-        mcp = create_mcp_server(project_name, db_manager=db_manager)
+        mcp, project_name = server
         
         assert mcp is not None
         assert mcp.name == f"jedi-mcp-{project_name}"
     
-    def test_create_server_registers_tools(self, db_with_content):
+    async def test_create_server_registers_tools(self, server):
         """Test that tools are registered for each content group."""
-        db_path, db_manager, project_name = db_with_content
-        
-        mcp = create_mcp_server(project_name, db_manager=db_manager)
+        mcp, _ = server
         
-        # Get registered tools - this is a dict in FastMCP
-        tools_dict = mcp._tool_manager._tools
+        tools = await mcp.list_tools()
         
-        assert len(tools_dict) == 2
-        tool_names = list(tools_dict.keys())
+        assert len(tools) == 2
+        tool_names = [tool.name for tool in tools]
         assert "getting_started" in tool_names
         assert "api_reference" in tool_names
     
-    def test_create_server_tool_descriptions(self, db_with_content):
+    async def test_create_server_tool_descriptions(self, server):
         """Test that tool descriptions are generated correctly."""
-        db_path, db_manager, project_name = db_with_content
-        
-        mcp = create_mcp_server(project_name, db_manager=db_manager)
+        mcp, _ = server
         
-        tools_dict = mcp._tool_manager._tools
-        
-        for tool_name, tool in tools_dict.items():
+        for tool in await mcp.list_tools():
             assert tool.description is not None
             assert len(tool.description) > 0
             assert "#" not in tool.description  # Headers should be removed
@@ -194,18 +192,18 @@ class TestMCPServerCreation:
         # Initialize schema first
         db_manager.initialize_schema("nonexistent-project")
         
-        with pytest.raises(ValueError, match="not found or has no content groups"):
-            create_mcp_server("nonexistent-project", db_manager=db_manager)
+        try:
+            with pytest.raises(ValueError, match="not found or has no content groups"):
+                create_mcp_server("nonexistent-project", db_manager=db_manager)
+        finally:
+            db_manager.close()
     
-    def test_create_server_tool_invocation(self, db_with_content):
+    async def test_create_server_tool_invocation(self, server):
         """Test that tools can be invoked and return markdown."""
-        db_path, db_manager, project_name = db_with_content
-        
-        mcp = create_mcp_server(project_name, db_manager=db_manager)
+        mcp, _ = server
         
-        # Get a tool from the internal tool manager
-        tools_dict = mcp._tool_manager._tools
-        tool = tools_dict.get("getting_started")
+        # Look the tool up through the server's public API
+        tool = await mcp.get_tool("getting_started")
         assert tool is not None
         
         # Invoke the tool function
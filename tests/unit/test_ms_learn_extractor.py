@@ -0,0 +1,51 @@
+"""Unit tests for the Microsoft Learn navigation extractor."""
+
+from jedi_mcp.ms_learn_extractor import _extract_links_from_expanded_tree, is_microsoft_learn_url
+
+
+BASE_URL = "https://learn.microsoft.com/en-us/azure/"
+
+TREE_HTML = """
+<html><body>
+<ul class="tree table-of-contents">
+  <li role="none"><a class="tree-item" href="/en-us/azure/overview">Overview</a></li>
+  <li role="none">
+    <span class="tree-expander">Get started</span>
+    <ul class="tree-group">
+      <li role="none"><a class="tree-item" href="quickstart">Quickstart</a></li>
+      <li role="none">
+        <span class="tree-expander">Tutorials</span>
+        <ul class="tree-group">
+          <li role="none"><a class="tree-item" href="tutorials/first">First app</a></li>
+          <li role="none"><a class="tree-item" href="#anchor">Anchor</a></li>
+        </ul>
+      </li>
+    </ul>
+  </li>
+  <li role="none"><a class="tree-item" href="https://github.com/azure">GitHub</a></li>
+  <li role="none"><a class="tree-item" href="/en-us/azure/overview">Overview again</a></li>
+</ul>
+</body></html>
+"""
+
+
+def test_extract_links_from_expanded_tree():
+    """Test that tree links keep their expander categories and are filtered."""
+    links = _extract_links_from_expanded_tree(TREE_HTML, BASE_URL)
+
+    assert [(link.url, link.title, link.category) for link in links] == [
+        ("https://learn.microsoft.com/en-us/azure/overview", "Overview", None),
+        ("https://learn.microsoft.com/en-us/azure/quickstart", "Quickstart", "Get started"),
+        ("https://learn.microsoft.com/en-us/azure/tutorials/first", "First app", "Tutorials"),
+    ]
+
+
+def test_extract_links_without_tree():
+    """Test that pages without the tree navigation yield no links."""
+    assert _extract_links_from_expanded_tree("<html><body><nav></nav></body></html>", BASE_URL) == []
+
+
+def test_is_microsoft_learn_url():
+    """Test Microsoft Learn URL detection."""
+    assert is_microsoft_learn_url("https://learn.microsoft.com/en-us/azure/")
+    assert not is_microsoft_learn_url("https://docs.example.com/")
@@ -1,13 +1,47 @@
 """Unit tests for navigation extraction."""
 
 import pytest
-from unittest.mock import Mock, patch
-from jedi_mcp.navigation_extractor import extract_navigation_links, _fallback_link_extraction
+from unittest.mock import AsyncMock, Mock, patch
+from jedi_mcp.navigation_extractor import (
+    extract_navigation_links,
+    _fallback_link_extraction,
+    _FALLBACK_STRAINER,
+    _get_ai_agent,
+    clear_ai_navigation_cache,
+    _collect_nav_html,
+    _parse_agent_json,
+)
 from jedi_mcp.models import DocumentationLink
 from bs4 import BeautifulSoup
 
 
-def test_extract_navigation_links_filters_external_links():
+@pytest.fixture(autouse=True)
+def enable_ai_fallback(monkeypatch):
+    """Route sidebar misses through the (mocked) AI fallback."""
+    monkeypatch.setenv("JEDI_ENABLE_AI_FALLBACK", "1")
+    # Each test mocks Agent, so never reuse an agent or answer cached by another test
+    _get_ai_agent.cache_clear()
+    clear_ai_navigation_cache()
+    yield
+    _get_ai_agent.cache_clear()
+    clear_ai_navigation_cache()
+
+
+@pytest.fixture
+def agent_class(monkeypatch):
+    """Replace the Strands Agent class with a mock; tests can count constructions."""
+    agent_class = Mock()
+    monkeypatch.setattr("jedi_mcp.navigation_extractor.Agent", agent_class)
+    return agent_class
+
+
+@pytest.fixture
+def mock_agent(agent_class):
+    """The mock agent instance; tests set its responses."""
+    return agent_class.return_value
+
+
+def test_extract_navigation_links_filters_external_links(mock_agent):
     """Test that external links are filtered out."""
     html = """
     <html>
@@ -21,25 +55,22 @@ def test_extract_navigation_links_filters_external_links():
     base_url = "https://example.com"
     
     # Mock the Agent to return a simple list
-    with patch('jedi_mcp.navigation_extractor.Agent') as MockAgent:
-        mock_agent_instance = Mock()
-        mock_agent_instance.return_value = """
-        [
-            {"url": "/docs/intro", "title": "Introduction", "category": null},
-            {"url": "https://example.com/docs/guide", "title": "Guide", "category": null},
-            {"url": "https://external.com/page", "title": "External", "category": null}
-        ]
-        """
-        MockAgent.return_value = mock_agent_instance
-        
-        links = extract_navigation_links(html, base_url)
-        
-        # Should only include links from the same domain
-        assert len(links) == 2
-        assert all(link.url.startswith("https://example.com") for link in links)
-
-
-def test_extract_navigation_links_filters_non_documentation():
+    mock_agent.return_value = """
+    [
+        {"url": "/docs/intro", "title": "Introduction", "category": null},
+        {"url": "https://example.com/docs/guide", "title": "Guide", "category": null},
+        {"url": "https://external.com/page", "title": "External", "category": null}
+    ]
+    """
+    
+    links = extract_navigation_links(html, base_url)
+    
+    # Should only include links from the same domain
+    assert len(links) == 2
+    assert all(link.url.startswith("https://example.com") for link in links)
+
+
+def test_extract_navigation_links_filters_non_documentation(mock_agent):
     """Test that non-documentation links are filtered out."""
     html = """
     <html>
@@ -53,26 +84,23 @@ def test_extract_navigation_links_filters_non_documentation():
     """
     base_url = "https://example.com"
     
-    with patch('jedi_mcp.navigation_extractor.Agent') as MockAgent:
-        mock_agent_instance = Mock()
-        mock_agent_instance.return_value = """
-        [
-            {"url": "/docs/intro", "title": "Introduction", "category": null},
-            {"url": "/login", "title": "Login", "category": null},
-            {"url": "https://twitter.com/example", "title": "Twitter", "category": null},
-            {"url": "/search?q=test", "title": "Search", "category": null}
-        ]
-        """
-        MockAgent.return_value = mock_agent_instance
-        
-        links = extract_navigation_links(html, base_url)
-        
-        # Should only include the documentation link
-        assert len(links) == 1
-        assert links[0].url == "https://example.com/docs/intro"
-
-
-def test_extract_navigation_links_resolves_relative_urls():
+    mock_agent.return_value = """
+    [
+        {"url": "/docs/intro", "title": "Introduction", "category": null},
+        {"url": "/login", "title": "Login", "category": null},
+        {"url": "https://twitter.com/example", "title": "Twitter", "category": null},
+        {"url": "/search?q=test", "title": "Search", "category": null}
+    ]
+    """
+    
+    links = extract_navigation_links(html, base_url)
+    
+    # Should only include the documentation link
+    assert len(links) == 1
+    assert links[0].url == "https://example.com/docs/intro"
+
+
+def test_extract_navigation_links_resolves_relative_urls(mock_agent):
     """Test that relative URLs are resolved to absolute URLs."""
     html = """
     <html>
@@ -84,23 +112,20 @@ def test_extract_navigation_links_resolves_relative_urls():
     """
     base_url = "https://example.com/docs/"
     
-    with patch('jedi_mcp.navigation_extractor.Agent') as MockAgent:
-        mock_agent_instance = Mock()
-        mock_agent_instance.return_value = """
-        [
-            {"url": "/docs/intro", "title": "Introduction", "category": null},
-            {"url": "guide.html", "title": "Guide", "category": null}
-        ]
-        """
-        MockAgent.return_value = mock_agent_instance
-        
-        links = extract_navigation_links(html, base_url)
-        
-        # All URLs should be absolute
-        assert all(link.url.startswith("https://") for link in links)
-
-
-def test_extract_navigation_links_removes_duplicates():
+    mock_agent.return_value = """
+    [
+        {"url": "/docs/intro", "title": "Introduction", "category": null},
+        {"url": "guide.html", "title": "Guide", "category": null}
+    ]
+    """
+    
+    links = extract_navigation_links(html, base_url)
+    
+    # All URLs should be absolute
+    assert all(link.url.startswith("https://") for link in links)
+
+
+def test_extract_navigation_links_removes_duplicates(mock_agent):
     """Test that duplicate URLs are removed."""
     html = """
     <html>
@@ -112,20 +137,35 @@ def test_extract_navigation_links_removes_duplicates():
     """
     base_url = "https://example.com"
     
-    with patch('jedi_mcp.navigation_extractor.Agent') as MockAgent:
-        mock_agent_instance = Mock()
-        mock_agent_instance.return_value = """
-        [
-            {"url": "/docs/intro", "title": "Introduction", "category": null},
-            {"url": "/docs/intro", "title": "Intro", "category": null}
-        ]
-        """
-        MockAgent.return_value = mock_agent_instance
-        
-        links = extract_navigation_links(html, base_url)
-        
-        # Should only have one link
-        assert len(links) == 1
+    mock_agent.return_value = """
+    [
+        {"url": "/docs/intro", "title": "Introduction", "category": null},
+        {"url": "/docs/intro", "title": "Intro", "category": null}
+    ]
+    """
+    
+    links = extract_navigation_links(html, base_url)
+    
+    # Should only have one link
+    assert len(links) == 1
+
+
+def test_extract_navigation_links_collapses_fragment_variants(mock_agent):
+    """Test that links differing only by fragment or trailing slash count as one page."""
+    html = "<html><nav><a href=\"/docs/intro\">Introduction</a></nav></html>"
+    
+    mock_agent.return_value = """
+    [
+        {"url": "/docs/intro", "title": "Introduction", "category": null},
+        {"url": "/docs/intro#top", "title": "Top", "category": null},
+        {"url": "/docs/intro/", "title": "Intro", "category": null}
+    ]
+    """
+    
+    links = extract_navigation_links(html, "https://example.com")
+    
+    # The first occurrence is kept with its original URL
+    assert [(link.url, link.title) for link in links] == [("https://example.com/docs/intro", "Introduction")]
 
 
 def test_fallback_link_extraction():
@@ -150,7 +190,44 @@ def test_fallback_link_extraction():
     assert links[0]['category'] == 'Getting Started'
 
 
-def test_extract_navigation_links_with_categories():
+def test_fallback_link_extraction_skips_nested_menu_items():
+    """Test that menu items classed like navigation are not read again inside their menu."""
+    items = "".join(
+        f'<li class="menu__list-item"><a class="menu__link" href="/docs/p{i}">Page {i}</a></li>'
+        for i in range(5)
+    )
+    html = f'<html><nav class="menu"><ul class="menu__list">{items}</ul></nav></html>'
+    soup = BeautifulSoup(html, 'lxml')
+    
+    links = _fallback_link_extraction(soup, "https://example.com")
+    
+    assert [link['url'] for link in links] == [f"/docs/p{i}" for i in range(5)]
+
+
+def test_fallback_strainer_matches_full_parse_on_large_page():
+    """Test that parsing only navigation-like elements finds the same fallback links."""
+    body = "".join(
+        f'<div class="content"><p>Paragraph {i} <a href="/blog/{i}">Post</a></p></div>'
+        for i in range(500)
+    )
+    html = f"""
+    <html><body>
+        <nav><h2>Guides</h2><a href="/docs/intro">Introduction</a></nav>
+        <main>{body}<div class="Page-TOC"><a href="/docs/setup">Setup</a></div></main>
+    </body></html>
+    """
+    base_url = "https://example.com"
+    
+    strained = BeautifulSoup(html, 'lxml', parse_only=_FALLBACK_STRAINER)
+    links = _fallback_link_extraction(strained, base_url)
+    
+    assert links == _fallback_link_extraction(BeautifulSoup(html, 'lxml'), base_url)
+    assert [link['url'] for link in links] == ['/docs/intro', '/docs/setup']
+    assert links[0]['category'] == 'Guides'
+    assert strained.find('main') is None
+
+
+def test_extract_navigation_links_with_categories(mock_agent):
     """Test that categories are preserved from navigation structure."""
     html = """
     <html>
@@ -161,31 +238,200 @@ def test_extract_navigation_links_with_categories():
     """
     base_url = "https://example.com"
     
-    with patch('jedi_mcp.navigation_extractor.Agent') as MockAgent:
-        mock_agent_instance = Mock()
-        mock_agent_instance.return_value = """
-        [
-            {"url": "/docs/intro", "title": "Introduction", "category": "Getting Started"}
-        ]
-        """
-        MockAgent.return_value = mock_agent_instance
-        
-        links = extract_navigation_links(html, base_url)
-        
-        assert len(links) == 1
-        assert links[0].category == "Getting Started"
-
-
-def test_extract_navigation_links_empty_html():
+    mock_agent.return_value = """
+    [
+        {"url": "/docs/intro", "title": "Introduction", "category": "Getting Started"}
+    ]
+    """
+    
+    links = extract_navigation_links(html, base_url)
+    
+    assert len(links) == 1
+    assert links[0].category == "Getting Started"
+
+
+def test_extract_navigation_links_empty_html(mock_agent):
     """Test handling of empty HTML content."""
     html = "<html></html>"
     base_url = "https://example.com"
     
-    with patch('jedi_mcp.navigation_extractor.Agent') as MockAgent:
-        mock_agent_instance = Mock()
-        mock_agent_instance.run.return_value = "[]"
-        MockAgent.return_value = mock_agent_instance
-        
-        links = extract_navigation_links(html, base_url)
-        
-        assert links == []
+    mock_agent.return_value = "[]"
+    
+    links = extract_navigation_links(html, base_url)
+    
+    assert links == []
+
+
+def test_extract_navigation_links_skips_ai_when_disabled(monkeypatch, agent_class):
+    """Test that sidebar misses use link heuristics unless the AI fallback is enabled."""
+    monkeypatch.delenv("JEDI_ENABLE_AI_FALLBACK")
+    html = """
+    <html>
+        <nav>
+            <h2>Getting Started</h2>
+            <ul>
+                <li><a href="/docs/intro">Introduction</a></li>
+                <li><a href="/docs/intro">Introduction</a></li>
+                <li><a href="/login">Login</a></li>
+            </ul>
+        </nav>
+    </html>
+    """
+    base_url = "https://example.com"
+    
+    links = extract_navigation_links(html, base_url)
+    
+    agent_class.assert_not_called()
+    assert len(links) == 1
+    assert links[0].url == "https://example.com/docs/intro"
+
+
+def test_extract_navigation_links_skips_ai_for_structured_heuristics(agent_class):
+    """Test that categorized heuristic links are returned without asking the model."""
+    html = """
+    <html>
+        <nav>
+            <h2>Getting Started</h2>
+            <a href="/docs/intro">Introduction</a>
+            <a href="/docs/setup">Setup</a>
+            <a href="/docs/usage">Usage</a>
+        </nav>
+    </html>
+    """
+    
+    links = extract_navigation_links(html, "https://example.com")
+    
+    agent_class.assert_not_called()
+    assert [link.url for link in links] == [
+        "https://example.com/docs/intro",
+        "https://example.com/docs/setup",
+        "https://example.com/docs/usage",
+    ]
+    assert all(link.category == "Getting Started" for link in links)
+
+
+def test_extract_navigation_links_reuses_ai_agent(agent_class, mock_agent):
+    """Test that the AI agent is built once and its conversation reset per call."""
+    html = """
+    <html>
+        <nav>
+            <a href="/docs/intro">Introduction</a>
+        </nav>
+    </html>
+    """
+    base_url = "https://example.com"
+    
+    mock_agent.return_value = '[{"url": "/docs/intro", "title": "Introduction"}]'
+    
+    extract_navigation_links(html, base_url)
+    mock_agent.messages = ["previous conversation"]
+    # A different base URL, so the first answer is not served from the cache
+    links = extract_navigation_links(html, base_url + "/docs/")
+    
+    assert agent_class.call_count == 1
+    assert mock_agent.call_count == 2
+    assert mock_agent.messages == []
+    assert len(links) == 1
+
+
+def test_extract_navigation_links_rebuilds_ai_agent_for_new_model(monkeypatch, agent_class, mock_agent):
+    """Test that a cached agent is only reused while the navigation model setting is unchanged."""
+    html = "<html><nav><a href=\"/docs/intro\">Introduction</a></nav></html>"
+    
+    mock_agent.return_value = '[{"url": "/docs/intro", "title": "Introduction"}]'
+    
+    monkeypatch.setenv("JEDI_NAVIGATION_MODEL", "model-a")
+    extract_navigation_links(html, "https://example.com")
+    extract_navigation_links(html, "https://example.com")
+    assert agent_class.call_count == 1
+    
+    monkeypatch.setenv("JEDI_NAVIGATION_MODEL", "model-b")
+    extract_navigation_links(html, "https://example.com")
+    assert agent_class.call_count == 2
+
+
+def test_extract_navigation_links_caches_ai_answers(mock_agent):
+    """Test that unchanged navigation is answered from the cache without calling the model."""
+    page = "<html><nav><a href=\"/docs/intro\">Introduction</a></nav><main>{}</main></html>"
+    
+    mock_agent.return_value = '[{"url": "/docs/intro", "title": "Introduction"}]'
+    
+    first = extract_navigation_links(page.format("Version 1"), "https://example.com")
+    # Only the navigation is sent to the model, so other page changes still hit the cache
+    second = extract_navigation_links(page.format("Version 2"), "https://example.com")
+    assert mock_agent.call_count == 1
+    assert second == first
+    
+    # Callers get copies, so editing a result does not change the cache
+    second[0].title = "Edited"
+    assert extract_navigation_links(page.format("Version 3"), "https://example.com")[0].title == "Introduction"
+    
+    mock_agent.return_value = "Not JSON"
+    extract_navigation_links(page.format("Version 1"), "https://example.com/other/")
+    extract_navigation_links(page.format("Version 1"), "https://example.com/other/")
+    # Answers that could not be parsed are not cached
+    assert mock_agent.call_count == 3
+
+
+def test_extract_navigation_links_malformed_ai_json_uses_fallback(mock_agent):
+    """Test that a malformed JSON answer falls back to link heuristics and is not cached."""
+    html = """
+    <html>
+        <nav>
+            <h2>Getting Started</h2>
+            <a href="/docs/intro">Introduction</a>
+            <a href="/docs/setup">Setup</a>
+        </nav>
+    </html>
+    """
+    
+    mock_agent.return_value = '[{"url": "/docs/other", "title": }]'
+    
+    links = extract_navigation_links(html, "https://example.com")
+    extract_navigation_links(html, "https://example.com")
+    
+    assert [link.url for link in links] == ["https://example.com/docs/intro", "https://example.com/docs/setup"]
+    assert links[0].category == "Getting Started"
+    assert mock_agent.call_count == 2
+
+
+def test_collect_nav_html_keeps_outer_regions_only():
+    """Test that nested nav regions are not duplicated and the region cap applies."""
+    html = """
+    <html><body>
+        <div class="hero">Marketing</div>
+        <aside><nav><a href="/docs/a">A</a></nav></aside>
+        <nav><a href="/docs/b">B</a></nav>
+        <nav><a href="/docs/c">C</a></nav>
+        <nav><a href="/docs/d">D</a></nav>
+    </body></html>
+    """
+    
+    nav_html = _collect_nav_html(html, max_chars=15000)
+    
+    assert nav_html.count('/docs/a') == 1
+    assert '/docs/c' in nav_html
+    assert '/docs/d' not in nav_html
+    assert 'Marketing' not in nav_html
+    assert _collect_nav_html("", max_chars=100) == ""
+
+
+def test_parse_agent_json():
+    """Test that the JSON array is pulled out of surrounding model chatter."""
+    response = 'Here you go:\n```json\n[{"url": "/docs/ü", "title": "Intro"}, "stray"]\n```'
+    
+    assert _parse_agent_json(response) == [{"url": "/docs/ü", "title": "Intro"}]
+    assert _parse_agent_json("no links found") == []
+    with pytest.raises(ValueError):
+        _parse_agent_json("[not json]")
+
+
+async def test_extract_navigation_links_browser_inside_running_loop():
+    """Test that browser mode works when called synchronously under a running loop."""
+    expected = [DocumentationLink(url="https://example.com/docs/intro", title="Intro")]
+    
+    with patch('jedi_mcp.navigation_extractor.PLAYWRIGHT_AVAILABLE', True), \
+         patch('jedi_mcp.navigation_extractor._extract_with_browser', new=AsyncMock(return_value=expected)):
+        links = extract_navigation_links("<html></html>", "https://example.com", use_browser=True)
+    
+    assert links == expected
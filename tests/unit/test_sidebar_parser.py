@@ -0,0 +1,314 @@
+"""Unit tests for the shared sidebar parser."""
+
+from urllib.parse import urljoin, urlparse
+
+import pytest
+from bs4 import BeautifulSoup
+
+from jedi_mcp._sidebar_parser import (
+    find_sidebar,
+    extract_links_from_sidebar,
+    create_doc_link,
+    canonical_url,
+    fast_urljoin,
+    is_blocked_url,
+    NAV_STRAINER,
+)
+
+
+BASE_URL = "https://example.com/docs/"
+
+
+def _soup(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, 'lxml')
+
+
+DOCUSAURUS_HTML = """
+<html><body>
+<aside class="theme-doc-sidebar-container">
+  <ul class="menu__list">
+    <li class="theme-doc-sidebar-item-link"><a href="/docs/intro">Intro</a></li>
+    <li class="theme-doc-sidebar-item-category">
+      <a class="menu__link menu__link--sublist" href="/docs/guides">Guides</a>
+      <ul class="menu__list">
+        <li><a href="/docs/guides/install">Install</a></li>
+        <li><a href="/docs/guides/configure">Configure</a></li>
+        <li><a href="/docs/intro">Intro again</a></li>
+      </ul>
+    </li>
+    <li class="theme-doc-sidebar-item-link"><a href="/docs/faq">FAQ</a></li>
+  </ul>
+</aside>
+<main><a href="/blog">Blog</a></main>
+</body></html>
+"""
+
+MATERIAL_HTML = """
+<html><body>
+<div class="md-sidebar md-sidebar--primary">
+  <nav class="md-nav md-nav--primary">
+    <ul class="md-nav__list">
+      <li class="md-nav__item"><a class="md-nav__link" href="index.html">Home</a></li>
+      <li class="md-nav__item md-nav__item--nested">
+        <a class="md-nav__link" href="usage/">Usage</a>
+        <nav class="md-nav">
+          <ul class="md-nav__list">
+            <li class="md-nav__item"><a class="md-nav__link" href="usage/cli/">CLI</a></li>
+            <li class="md-nav__item"><a class="md-nav__link" href="usage/api/">API</a></li>
+          </ul>
+        </nav>
+      </li>
+      <li class="md-nav__item"><a class="md-nav__link" href="faq/">FAQ</a></li>
+    </ul>
+  </nav>
+</div>
+</body></html>
+"""
+
+GENERIC_HTML = """
+<html><body>
+<nav id="docs-sidebar">
+  <h3>Basics</h3>
+  <ul>
+    <li><a href="/docs/a">A</a></li>
+    <li><a href="/docs/b">B</a></li>
+  </ul>
+  <h3>Advanced</h3>
+  <ul>
+    <li><a href="/docs/c">C</a></li>
+    <li><a href="/docs/d">D</a></li>
+    <li><a href="https://github.com/example/repo">GitHub</a></li>
+  </ul>
+</nav>
+</body></html>
+"""
+
+
+def test_find_sidebar_requires_enough_links():
+    """Sidebars with fewer than five links are ignored."""
+    soup = _soup('<aside class="sidebar"><a href="/a">A</a><a href="/b">B</a></aside>')
+    assert find_sidebar(soup) is None
+
+
+def test_find_sidebar_skips_banners():
+    """Elements marked as banners are never picked as the sidebar."""
+    links = ''.join(f'<a href="/x{i}">X{i}</a>' for i in range(6))
+    soup = _soup(f'<nav class="banner">{links}</nav>')
+    assert find_sidebar(soup) is None
+
+
+def test_find_sidebar_prefers_higher_priority_pattern():
+    """A Material primary sidebar wins over an earlier generic sidebar."""
+    links = ''.join(f'<a href="/x{i}">X{i}</a>' for i in range(6))
+    soup = _soup(
+        f'<nav id="menu">{links}</nav>'
+        f'<div class="md-sidebar md-sidebar--primary">{links}</div>'
+    )
+    assert find_sidebar(soup).name == 'div'
+
+
+def test_extract_docusaurus_links_with_categories():
+    """Docusaurus categories are attached to their nested links."""
+    sidebar = find_sidebar(_soup(DOCUSAURUS_HTML))
+    assert sidebar is not None and sidebar.name == 'aside'
+
+    links = extract_links_from_sidebar(sidebar, BASE_URL)
+
+    assert [link.url for link in links] == [
+        "https://example.com/docs/intro",
+        "https://example.com/docs/guides/install",
+        "https://example.com/docs/guides/configure",
+        "https://example.com/docs/faq",
+    ]
+    assert links[0].category is None
+    assert links[1].category == "Guides"
+    # First occurrence wins when a URL appears twice
+    assert links[0].title == "Intro"
+
+
+def test_extract_material_mkdocs_links_with_categories():
+    """Material for MkDocs nested sections become categories."""
+    sidebar = find_sidebar(_soup(MATERIAL_HTML))
+    links = extract_links_from_sidebar(sidebar, BASE_URL)
+
+    assert [(link.title, link.category) for link in links] == [
+        ("Home", None),
+        ("Usage", None),
+        ("CLI", "Usage"),
+        ("API", "Usage"),
+        ("FAQ", None),
+    ]
+    assert links[2].url == "https://example.com/docs/usage/cli/"
+
+
+def test_extract_material_mkdocs_links_skips_toc_and_label_sections():
+    """Page tables of contents are skipped and label-only sections borrow no category."""
+    html = """
+    <div class="md-sidebar md-sidebar--primary"><nav class="md-nav md-nav--primary">
+      <ul class="md-nav__list">
+        <li class="md-nav__item md-nav__item--nested">
+          <label class="md-nav__link">Guides</label>
+          <nav class="md-nav"><ul class="md-nav__list">
+            <li class="md-nav__item md-nav__item--active">
+              <a class="md-nav__link" href="guides/setup/">Setup</a>
+              <nav class="md-nav md-nav--secondary"><ul class="md-nav__list">
+                <li class="md-nav__item"><a class="md-nav__link" href="guides/setup/#install">Install</a></li>
+              </ul></nav>
+            </li>
+            <li class="md-nav__item md-nav__item--nested">
+              <div class="md-nav__link md-nav__container"><a class="md-nav__link" href="guides/deploy/">Deploy</a></div>
+              <nav class="md-nav"><ul class="md-nav__list">
+                <li class="md-nav__item"><a class="md-nav__link" href="guides/deploy/cloud/">Cloud</a></li>
+              </ul></nav>
+            </li>
+          </ul></nav>
+        </li>
+      </ul>
+    </nav></div>
+    """
+    links = extract_links_from_sidebar(_soup(html).div, BASE_URL)
+
+    assert [(link.title, link.category) for link in links] == [
+        ("Setup", None),
+        ("Deploy", None),
+        ("Cloud", "Deploy"),
+    ]
+
+
+def test_extract_generic_links_uses_preceding_heading():
+    """Generic sidebars take their category from the nearest preceding heading."""
+    sidebar = find_sidebar(_soup(GENERIC_HTML))
+    links = extract_links_from_sidebar(sidebar, BASE_URL)
+
+    assert [(link.title, link.category) for link in links] == [
+        ("A", "Basics"),
+        ("B", "Basics"),
+        ("C", "Advanced"),
+        ("D", "Advanced"),
+    ]
+
+
+def test_create_doc_link_filters():
+    """Anchors, external domains and non-documentation URLs are rejected."""
+    def make(href, text="Link"):
+        tag = _soup(f'<a href="{href}">{text}</a>').a
+        return create_doc_link(tag, BASE_URL, "example.com", None)
+
+    assert make("#section") is None
+    assert make("/docs/page", text="") is None
+    assert make("https://other.com/docs") is None
+    assert make("/login") is None
+    assert make("/docs/search?search=x") is None
+    assert make("mailto:team@example.com") is None
+    assert make("/Docs/Auth/Overview") is None
+    assert make("/docs/authoring") is None
+
+    link = make("guide/")
+    assert link.url == "https://example.com/docs/guide/"
+    assert link.title == "Link"
+
+
+def test_extract_generic_links_ignores_headings_outside_sidebar():
+    """Headings before the sidebar do not leak in as categories."""
+    links_html = ''.join(f'<li><a href="/docs/p{i}">Page {i}</a></li>' for i in range(5))
+    soup = _soup(f"""
+    <html><body>
+    <h1>Welcome to the docs</h1>
+    <nav id="sidebar"><ul>{links_html}</ul><h4>{'x' * 60}</h4><a href="/docs/last">Last</a></nav>
+    </body></html>
+    """)
+    links = extract_links_from_sidebar(find_sidebar(soup), BASE_URL)
+
+    assert len(links) == 6
+    assert all(link.category is None for link in links)
+
+
+def test_extract_generic_links_skips_empty_headings():
+    """An empty heading does not replace the current category with an empty one."""
+    links_html = ''.join(f'<a href="/docs/p{i}">Page {i}</a>' for i in range(5))
+    soup = _soup(f'<nav id="sidebar"><h3></h3>{links_html}<h3>Guides</h3><h4> </h4><a href="/docs/g">G</a></nav>')
+    links = extract_links_from_sidebar(find_sidebar(soup), BASE_URL)
+
+    assert [link.category for link in links] == [None] * 5 + ["Guides"]
+
+
+def test_extract_generic_links_heading_anchor_keeps_outer_category():
+    """A link wrapped in a heading is not filed under its own title."""
+    links_html = ''.join(f'<a href="/docs/p{i}">Page {i}</a>' for i in range(4))
+    soup = _soup(f"""
+    <nav id="sidebar">
+        <h3><a href="/docs/">Docs Home</a></h3>{links_html}
+        <h3>Reference</h3><h3><a href="/docs/api/">API</a></h3><a href="/docs/api/x">X</a>
+    </nav>
+    """)
+    links = extract_links_from_sidebar(find_sidebar(soup), BASE_URL)
+
+    assert [(link.title, link.category) for link in links] == [
+        ("Docs Home", None),
+        ("Page 0", "Docs Home"),
+        ("Page 1", "Docs Home"),
+        ("Page 2", "Docs Home"),
+        ("Page 3", "Docs Home"),
+        ("API", "Reference"),
+        ("X", "API"),
+    ]
+
+
+@pytest.mark.parametrize("href", [
+    "/docs/page",
+    "/docs/page?x=1#frag",
+    "guide/",
+    "../other/",
+    "/docs/./a/../b",
+    "//cdn.example.com/lib.js",
+    "https://example.com/docs/x",
+    "https://user@other.com:8080/path?q",
+    "http://example.com",
+    "?page=2",
+])
+def test_fast_urljoin_matches_urljoin(href):
+    """The fast path resolves exactly like urljoin/urlparse."""
+    absolute_url, netloc = fast_urljoin(BASE_URL, urlparse(BASE_URL), href)
+
+    assert absolute_url == urljoin(BASE_URL, href)
+    assert netloc == urlparse(absolute_url).netloc
+
+
+@pytest.mark.parametrize("html", [DOCUSAURUS_HTML, MATERIAL_HTML, GENERIC_HTML])
+def test_nav_strainer_matches_full_parse(html):
+    """Parsing with NAV_STRAINER yields the same sidebar links as a full parse."""
+    full = extract_links_from_sidebar(find_sidebar(_soup(html)), BASE_URL)
+    strained_soup = BeautifulSoup(html, 'lxml', parse_only=NAV_STRAINER)
+    strained = extract_links_from_sidebar(find_sidebar(strained_soup), BASE_URL)
+
+    assert strained == full
+    assert strained_soup.find('main') is None
+
+
+@pytest.mark.parametrize("url, blocked", [
+    ("https://example.com/docs/intro", False),
+    ("https://example.com/docs/authoring", True),
+    ("https://GitHub.com/example/repo", True),
+    ("https://example.com/Login", True),
+    ("https://example.com/docs/search-tips", True),
+    ("mailto:team@example.com", True),
+    ("https://example.com/docs/downloads-api", True),
+    ("https://example.com/docs/register-hooks", True),
+    ("https://example.com/docs/signals", False),
+])
+def test_is_blocked_url(url, blocked):
+    """The blocklist matches its fragments anywhere in the URL, ignoring case."""
+    assert is_blocked_url(url) is blocked
+
+
+@pytest.mark.parametrize("url, canonical", [
+    ("https://example.com/docs/intro", "https://example.com/docs/intro"),
+    ("https://example.com/docs/intro#top", "https://example.com/docs/intro"),
+    ("https://example.com/docs/intro/", "https://example.com/docs/intro"),
+    ("HTTPS://Example.COM/docs/Intro", "https://example.com/docs/Intro"),
+    ("https://example.com", "https://example.com/"),
+    ("https://example.com/docs/?v=2#api", "https://example.com/docs?v=2"),
+])
+def test_canonical_url(url, canonical):
+    """Scheme and host are lowercased and fragments and trailing slashes dropped; the path case is kept."""
+    assert canonical_url(url) == canonical
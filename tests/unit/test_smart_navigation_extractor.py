@@ -0,0 +1,299 @@
+"""Unit tests for browser-based smart navigation extraction."""
+
+import os
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from jedi_mcp import smart_navigation_extractor
+from jedi_mcp.smart_navigation_extractor import (
+    extract_navigation_batch,
+    extract_navigation_smart,
+    fetch_rendered_html_batch,
+)
+
+
+SIDEBAR_HTML = """
+<html><body>
+<nav id="sidebar">
+  <a href="/docs/a">A</a><a href="/docs/b">B</a><a href="/docs/c">C</a>
+  <a href="/docs/d">D</a><a href="/docs/e">E</a>
+</nav>
+</body></html>
+"""
+
+
+@pytest.fixture(autouse=True)
+def html_cache(tmp_path, monkeypatch):
+    """Keep the rendered-HTML cache in a temporary directory and skip HTTP requests."""
+    monkeypatch.setattr(smart_navigation_extractor, 'HTML_CACHE_DIR', tmp_path)
+    monkeypatch.setattr(smart_navigation_extractor, '_fetch_static_page', AsyncMock(return_value=None))
+    smart_navigation_extractor.clear_navigation_cache()
+    validator = AsyncMock(return_value='"v1"')
+    monkeypatch.setattr(smart_navigation_extractor, '_fetch_cache_validator', validator)
+    return validator
+
+
+async def test_extract_navigation_smart_uses_html_cache(html_cache):
+    """Test that unchanged pages are served from the cache and new ETags re-render."""
+    url = "https://docs.example.com/docs/"
+    fetch = AsyncMock(return_value=SIDEBAR_HTML)
+
+    with patch.object(smart_navigation_extractor, 'fetch_rendered_html', new=fetch):
+        first = await extract_navigation_smart(url)
+        second = await extract_navigation_smart(url)
+        assert fetch.await_count == 1
+
+        await extract_navigation_smart(url, force_refresh=True)
+        assert fetch.await_count == 2
+
+        # A changed page is re-rendered once the in-memory results are dropped
+        html_cache.return_value = '"v2"'
+        await extract_navigation_smart(url)
+        assert fetch.await_count == 2
+        smart_navigation_extractor.clear_navigation_cache()
+        await extract_navigation_smart(url)
+        assert fetch.await_count == 3
+
+    assert len(first) == 5
+    assert second == first
+
+    # Cached results are copies; callers cannot corrupt the cache
+    second[0].title = "Changed"
+    assert (await extract_navigation_smart(url))[0].title == first[0].title
+
+
+def test_html_cache_removes_expired_and_over_budget_files(tmp_path, monkeypatch):
+    """Test that expired entries are deleted and the oldest files go once over budget."""
+    expired = tmp_path / "expired.html"
+    expired.write_text("old", encoding='utf-8')
+    stale_time = time.time() - smart_navigation_extractor.HTML_CACHE_TTL - 60
+    os.utime(expired, (stale_time, stale_time))
+
+    # Reading an expired entry removes it
+    assert smart_navigation_extractor._read_cached_html(expired) is None
+    assert not expired.exists()
+
+    monkeypatch.setattr(smart_navigation_extractor, 'HTML_CACHE_MAX_BYTES', 10)
+    for i, name in enumerate(["oldest", "older", "newest"]):
+        path = tmp_path / f"{name}.html"
+        path.write_text("x" * 4, encoding='utf-8')
+        os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+    orphan = tmp_path / "page.123.tmp"
+    orphan.write_text("partial", encoding='utf-8')
+    os.utime(orphan, (stale_time, stale_time))
+
+    smart_navigation_extractor._write_cached_html(tmp_path / "fresh.html", "y" * 4)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["fresh.html", "newest.html"]
+
+
+async def test_extract_navigation_smart_skips_browser_for_static_sidebar(monkeypatch):
+    """Test that server-rendered sidebars are parsed without launching a browser."""
+    static_page = MagicMock(text=SIDEBAR_HTML, headers={})
+    monkeypatch.setattr(smart_navigation_extractor, '_fetch_static_page', AsyncMock(return_value=static_page))
+    fetch = AsyncMock(return_value=SIDEBAR_HTML)
+
+    with patch.object(smart_navigation_extractor, 'fetch_rendered_html', new=fetch):
+        links = await extract_navigation_smart("https://docs.example.com/docs/")
+        assert len(links) == 5
+        fetch.assert_not_awaited()
+
+        static_page.text = "<html><body><div id='root'></div></body></html>"
+        links = await extract_navigation_smart("https://docs.example.com/docs/", force_refresh=True)
+        assert len(links) == 5
+        fetch.assert_awaited_once()
+
+
+async def test_extract_navigation_batch_isolates_failures():
+    """Test that every URL is parsed and a failed render does not sink the batch."""
+    def render(url, wait_for_selector=None, browser=None):
+        if 'broken' in url:
+            raise RuntimeError("navigation timeout")
+        return SIDEBAR_HTML if 'docs' in url else "<html></html>"
+
+    fetch = AsyncMock(side_effect=render)
+
+    with patch.object(smart_navigation_extractor, 'fetch_rendered_html', new=fetch):
+        results = await extract_navigation_batch(
+            [
+                "https://one.example.com/docs/",
+                "https://two.example.com/",
+                "https://broken.example.com/docs/",
+            ],
+            max_parallel=2
+        )
+
+    assert fetch.await_count == 3
+    assert len(results["https://one.example.com/docs/"]) == 5
+    assert results["https://two.example.com/"] == []
+    assert results["https://broken.example.com/docs/"] == []
+
+
+async def test_browser_pool_reuses_and_recycles_browsers():
+    """Test that pooled browsers are reused and replaced after enough renders."""
+    browsers = []
+
+    def launch(**kwargs):
+        browser = MagicMock()
+        browser.close = AsyncMock()
+        browser.is_connected.return_value = True
+        browsers.append(browser)
+        return browser
+
+    playwright = MagicMock()
+    playwright.chromium.launch = AsyncMock(side_effect=launch)
+    playwright.stop = AsyncMock()
+    starter = MagicMock()
+    starter.start = AsyncMock(return_value=playwright)
+
+    with patch.object(smart_navigation_extractor, 'async_playwright', return_value=starter):
+        pool = smart_navigation_extractor._BrowserPool(size=1, recycle_after=2)
+
+        first = await pool.acquire()
+        await pool.release(first)
+        assert await pool.acquire() is first
+        await pool.release(first)
+
+        # The second release hit the recycle limit, so a fresh browser is handed out
+        first.close.assert_awaited_once()
+        second = await pool.acquire()
+        assert second is not first
+        await pool.release(second)
+
+        await pool.close()
+
+    second.close.assert_awaited_once()
+    playwright.stop.assert_awaited_once()
+    assert len(browsers) == 2
+
+
+async def test_browser_pool_release_survives_recycle_errors():
+    """Test that a failed close or relaunch while recycling does not escape release."""
+    first = MagicMock()
+    first.close = AsyncMock(side_effect=RuntimeError("Target closed"))
+    first.is_connected.return_value = False
+    second = MagicMock()
+
+    playwright = MagicMock()
+    playwright.chromium.launch = AsyncMock(side_effect=[first, RuntimeError("Browser crashed"), second])
+    starter = MagicMock()
+    starter.start = AsyncMock(return_value=playwright)
+
+    with patch.object(smart_navigation_extractor, 'async_playwright', return_value=starter):
+        pool = smart_navigation_extractor._BrowserPool(size=1, recycle_after=5)
+
+        assert await pool.acquire() is first
+        # Disconnected, so it is recycled; both its close and the relaunch fail
+        await pool.release(first)
+
+        # The freed slot is launched into on the next checkout
+        assert await pool.acquire() is second
+
+
+async def test_block_nonessential_requests():
+    """Test that assets and analytics are aborted while pages and scripts load."""
+    def route_for(url, resource_type):
+        route = MagicMock()
+        route.request.url = url
+        route.request.resource_type = resource_type
+        route.abort = AsyncMock()
+        route.continue_ = AsyncMock()
+        return route
+
+    blocked = [
+        route_for("https://docs.example.com/logo.png", "image"),
+        route_for("https://docs.example.com/theme.css", "stylesheet"),
+        route_for("https://www.google-analytics.com/analytics.js", "script"),
+        route_for("https://cdn.segment.com/analytics.js", "script"),
+    ]
+    allowed = [
+        route_for("https://docs.example.com/docs/", "document"),
+        route_for("https://docs.example.com/assets/segment-tree.js", "script"),
+        route_for("https://docs.example.com/api/sidebar.json", "xhr"),
+    ]
+
+    for route in blocked + allowed:
+        await smart_navigation_extractor._block_nonessential_requests(route)
+
+    assert all(route.abort.await_count == 1 for route in blocked)
+    assert all(route.continue_.await_count == 1 for route in allowed)
+
+
+async def test_fetch_rendered_html_batch_reuses_page_per_origin():
+    """Test that URLs sharing an origin are rendered in one context, in input order."""
+    contexts = []
+
+    def new_context():
+        page = MagicMock()
+        page.route = AsyncMock()
+        page.wait_for_selector = AsyncMock()
+        page.url = None
+
+        async def goto(url, **kwargs):
+            if 'missing' in url:
+                raise RuntimeError("net::ERR_NAME_NOT_RESOLVED")
+            page.url = url
+
+        page.goto = AsyncMock(side_effect=goto)
+        page.content = AsyncMock(side_effect=lambda: f"<html>{page.url}</html>")
+        context = MagicMock()
+        context.new_page = AsyncMock(return_value=page)
+        context.close = AsyncMock()
+        contexts.append(context)
+        return context
+
+    browser = MagicMock()
+    browser.new_context = AsyncMock(side_effect=new_context)
+    pool = MagicMock()
+    pool.acquire = AsyncMock(return_value=browser)
+    pool.release = AsyncMock()
+
+    urls = [
+        "https://a.example.com/docs/1",
+        "https://b.example.com/docs/1",
+        "https://a.example.com/docs/2",
+        "https://a.example.com/missing",
+    ]
+    with patch.object(smart_navigation_extractor, '_get_pool', return_value=pool):
+        results = await fetch_rendered_html_batch(urls)
+
+    assert results == [
+        "<html>https://a.example.com/docs/1</html>",
+        "<html>https://b.example.com/docs/1</html>",
+        "<html>https://a.example.com/docs/2</html>",
+        "",
+    ]
+    assert len(contexts) == 2
+    assert all(context.close.await_count == 1 for context in contexts)
+    assert pool.release.await_count == 2
+
+
+async def test_fetch_rendered_html_batch_isolates_context_failures():
+    """Test that a browser failing to open a context only loses that origin's pages."""
+    async def new_context():
+        if len(browser.new_context.await_args_list) == 1:
+            raise RuntimeError("Browser has been closed")
+        page = MagicMock()
+        page.route = AsyncMock()
+        page.wait_for_selector = AsyncMock()
+        page.goto = AsyncMock()
+        page.content = AsyncMock(return_value="<html>rendered</html>")
+        context = MagicMock()
+        context.new_page = AsyncMock(return_value=page)
+        context.close = AsyncMock()
+        return context
+
+    browser = MagicMock()
+    browser.new_context = AsyncMock(side_effect=new_context)
+    pool = MagicMock()
+    pool.acquire = AsyncMock(return_value=browser)
+    pool.release = AsyncMock()
+
+    urls = ["https://a.example.com/docs/1", "https://b.example.com/docs/1", "https://a.example.com/docs/2"]
+    with patch.object(smart_navigation_extractor, '_get_pool', return_value=pool):
+        results = await fetch_rendered_html_batch(urls, max_parallel=1)
+
+    assert results == ["", "<html>rendered</html>", ""]
+    assert pool.release.await_count == 2